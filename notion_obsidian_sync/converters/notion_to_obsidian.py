@@ -7,6 +7,12 @@ import re
 from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 class NotionToObsidianConverter:
     """Converts Notion pages to Obsidian markdown format"""
@@ -122,8 +128,6 @@ class NotionToObsidianConverter:
         if not metadata:
             return ""
         
-        import yaml
-        
         # Clean up metadata for YAML
         clean_metadata = {}
         for key, value in metadata.items():
@@ -134,7 +138,7 @@ class NotionToObsidianConverter:
             return ""
         
         try:
-            yaml_content = yaml.dump(clean_metadata, default_flow_style=False, allow_unicode=True)
+            yaml_content = yaml.dump(clean_metadata, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
             return f"---\n{yaml_content}---"
         except Exception as e:
             self.logger.warning(f"Failed to generate frontmatter: {e}")
@@ -9,6 +9,11 @@ import logging
 from pathlib import Path
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 class ObsidianToNotionConverter:
     """Converts Obsidian markdown to Notion format"""
     
@@ -31,6 +36,19 @@ class ObsidianToNotionConverter:
         self.numbered_list_pattern = re.compile(r'^(\s*)\d+\.\s+(.+)$', re.MULTILINE)
         self.todo_pattern = re.compile(r'^(\s*)[-*+]\s+\[([ x])\]\s+(.+)$', re.MULTILINE)
         self.tag_pattern = re.compile(r'#([a-zA-Z0-9_-]+)')
+        
+        # Patterns used per section / per text run, compiled once
+        self.section_split_pattern = re.compile(r'\n\s*\n')
+        self.section_heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$')
+        self.quote_prefix_pattern = re.compile(r'^>\s*', re.MULTILINE)
+        self.bullet_start_pattern = re.compile(r'^[-*+]\s+')
+        self.numbered_start_pattern = re.compile(r'^\d+\.\s+')
+        self.todo_start_pattern = re.compile(r'^[-*+]\s+\[([ x])\]\s+')
+        self.bullet_item_pattern = re.compile(r'^[-*+]\s+(.+)')
+        self.numbered_item_pattern = re.compile(r'^\d+\.\s+(.+)')
+        self.todo_item_pattern = re.compile(r'^[-*+]\s+\[([ x])\]\s+(.+)')
+        self.bold_underscore_pattern = re.compile(r'__([^_]+)__')
+        self.italic_underscore_pattern = re.compile(r'_([^_]+)_')
     
     async def convert(self, markdown_content: str, file_path: Path) -> Dict:
         """Convert Obsidian markdown to Notion page data"""
@@ -72,7 +90,7 @@ class ObsidianToNotionConverter:
                     body = content[end_index + 5:].strip()
                     
                     # Parse YAML
-                    frontmatter = yaml.safe_load(frontmatter_text) or {}
+                    frontmatter = yaml.load(frontmatter_text, Loader=SafeLoader) or {}
                     
             except Exception as e:
                 self.logger.warning(f"Failed to parse frontmatter: {e}")
@@ -132,7 +150,7 @@ class ObsidianToNotionConverter:
         blocks = []
         
         # Split content into sections by double newlines
-        sections = re.split(r'\n\s*\n', content.strip())
+        sections = self.section_split_pattern.split(content.strip())
         
         for section in sections:
             if not section.strip():
@@ -159,7 +177,7 @@ class ObsidianToNotionConverter:
         # Check for different block types
         
         # Headings
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', section)
+        heading_match = self.section_heading_pattern.match(section)
         if heading_match:
             level = len(heading_match.group(1))
             text = heading_match.group(2)
@@ -174,19 +192,19 @@ class ObsidianToNotionConverter:
         
         # Blockquotes
         if section.startswith('>'):
-            quote_text = re.sub(r'^>\s*', '', section, flags=re.MULTILINE)
+            quote_text = self.quote_prefix_pattern.sub('', section)
             return self._create_quote_block(quote_text)
         
         # Lists (bulleted)
-        if re.match(r'^[-*+]\s+', section):
+        if self.bullet_start_pattern.match(section):
             return await self._create_list_block(section, 'bulleted_list_item')
         
         # Lists (numbered)
-        if re.match(r'^\d+\.\s+', section):
+        if self.numbered_start_pattern.match(section):
             return await self._create_list_block(section, 'numbered_list_item')
         
         # To-do items
-        if re.match(r'^[-*+]\s+\[([ x])\]\s+', section):
+        if self.todo_start_pattern.match(section):
             return await self._create_todo_block(section)
         
         # Images
@@ -253,9 +271,9 @@ class ObsidianToNotionConverter:
         """Create a list item block"""
         # Extract the first list item
         if list_type == 'bulleted_list_item':
-            match = re.match(r'^[-*+]\s+(.+)', text)
+            match = self.bullet_item_pattern.match(text)
         else:  # numbered_list_item
-            match = re.match(r'^\d+\.\s+(.+)', text)
+            match = self.numbered_item_pattern.match(text)
         
         if match:
             item_text = match.group(1)
@@ -271,7 +289,7 @@ class ObsidianToNotionConverter:
     
     async def _create_todo_block(self, text: str) -> Dict:
         """Create a to-do block"""
-        match = re.match(r'^[-*+]\s+\[([ x])\]\s+(.+)', text)
+        match = self.todo_item_pattern.match(text)
         if match:
             checked = match.group(1) == 'x'
             todo_text = match.group(2)
@@ -350,24 +368,24 @@ class ObsidianToNotionConverter:
         # Simple formatting detection (this could be much more sophisticated)
         if '**' in text or '__' in text:
             rich_text_obj["annotations"]["bold"] = True
-            text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-            text = re.sub(r'__([^_]+)__', r'\1', text)
+            text = self.bold_pattern.sub(r'\1', text)
+            text = self.bold_underscore_pattern.sub(r'\1', text)
             rich_text_obj["text"]["content"] = text
         
         if '*' in text or '_' in text:
             rich_text_obj["annotations"]["italic"] = True
-            text = re.sub(r'\*([^*]+)\*', r'\1', text)
-            text = re.sub(r'_([^_]+)_', r'\1', text)
+            text = self.italic_pattern.sub(r'\1', text)
+            text = self.italic_underscore_pattern.sub(r'\1', text)
             rich_text_obj["text"]["content"] = text
         
         if '~~' in text:
             rich_text_obj["annotations"]["strikethrough"] = True
-            text = re.sub(r'~~([^~]+)~~', r'\1', text)
+            text = self.strikethrough_pattern.sub(r'\1', text)
             rich_text_obj["text"]["content"] = text
         
         if '`' in text and not text.startswith('```'):
             rich_text_obj["annotations"]["code"] = True
-            text = re.sub(r'`([^`]+)`', r'\1', text)
+            text = self.inline_code_pattern.sub(r'\1', text)
             rich_text_obj["text"]["content"] = text
         
         # Handle links
@@ -5,14 +5,73 @@ Handles all Notion operations with intelligent caching and rate limiting
 
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional, Any
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timezone
 import logging
 
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Notion reports last_edited_time rounded down to the minute (plus a little for clock skew)
+EDIT_TIME_RESOLUTION = 90  # seconds
+
+def _edit_time_settled(last_edited_time: str, fetched_at: float) -> bool:
+    """True if no further edit could still carry last_edited_time when fetched_at was read"""
+    try:
+        if parse_datetime is not None:
+            edited = parse_datetime(last_edited_time).timestamp()
+        else:
+            edited = datetime.fromisoformat(last_edited_time.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return False
+    return fetched_at - edited >= EDIT_TIME_RESOLUTION
+
+class TokenBucket:
+    """Token-bucket rate limiter that smooths bursts to a steady request rate"""
+    
+    def __init__(self, capacity: float = 3, refill_rate: float = 3.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available, then consume it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+                self.last_refill = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
 class NotionSyncClient:
     """Enhanced Notion client for bidirectional sync operations"""
     
-    def __init__(self, token: str, database_ids: List[str]):
+    # Notion accepts at most this many children per create/append request
+    MAX_BLOCKS_PER_REQUEST = 100
+    
+    def __init__(self, token: str, database_ids: List[str], max_concurrency: int = 8,
+                 rate_limit: float = 3.0, max_retries: int = 3, page_cache_size: int = 4096,
+                 cache_dir: Optional[str] = None):
         self.token = token
         self.database_ids = database_ids
         self.base_url = "https://api.notion.com/v1"
@@ -22,22 +81,259 @@ class NotionSyncClient:
             "Content-Type": "application/json"
         }
         self.logger = logging.getLogger(__name__)
-        self._page_cache = {}
         self._last_sync_time = None
+        
+        # LRU of full page content: page_id -> (last_edited_time, page_data, fetched_at).
+        # Only pages whose edit time had settled when fetched are kept, since a second
+        # edit within the same minute leaves last_edited_time unchanged
+        self._page_cache: "OrderedDict[str, Tuple[str, Dict, float]]" = OrderedDict()
+        self._page_cache_size = page_cache_size
+        
+        # Optional on-disk copy of the page cache so restarts only fetch what changed
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self._load_page_cache()
+        
+        # Hash of the blocks last written to each page (and the page's edit time
+        # right after that write), to skip identical rewrites; persisted with the cache
+        self._block_hashes: Dict[str, Dict[str, Optional[str]]] = {}
+        self._load_block_hashes()
+        
+        # Shared HTTP session, created lazily so the client can be built outside a loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Bounds in-flight requests when page and block fetches fan out
+        self._sem = asyncio.Semaphore(max_concurrency)
+        
+        # Keeps request rate under Notion's limit (~3 requests/second)
+        self._bucket = TokenBucket(capacity=rate_limit, refill_rate=rate_limit)
+        self.max_retries = max_retries
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, reusing pooled keep-alive connections"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session and persist the page cache"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+        await asyncio.to_thread(self._save_page_cache)
+        await asyncio.to_thread(self._save_block_hashes)
+    
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue a rate-limited request, retrying 429 responses after Retry-After"""
+        session = await self._get_session()
+        
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            
+            async with self._sem:
+                response = await session.request(method, url, **kwargs)
+                
+                if response.status != 429 or attempt == self.max_retries:
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                
+                retry_after = float(response.headers.get("Retry-After", 1))
+                response.release()
+            
+            self.logger.warning(f"Rate limited by Notion, retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+    
+    def _get_cached_page(self, page_id: str, last_edited_time: Optional[str]) -> Optional[Dict]:
+        """Return cached page content if it matches the given edit time"""
+        entry = self._page_cache.get(page_id)
+        if entry is None or last_edited_time is None or entry[0] != last_edited_time:
+            return None
+        if not _edit_time_settled(entry[0], entry[2]):
+            del self._page_cache[page_id]
+            return None
+        
+        self._page_cache.move_to_end(page_id)
+        return entry[1]
+    
+    def _cache_page(self, page_data: Dict, fetched_at: float):
+        """Store page content fetched at fetched_at, evicting the least recently used entries"""
+        page_id = page_data.get("id")
+        last_edited_time = page_data.get("last_edited_time")
+        if not page_id or not last_edited_time:
+            return
+        
+        # Edited within the last minute: the same edit time may still get new content
+        if not _edit_time_settled(last_edited_time, fetched_at):
+            self._page_cache.pop(page_id, None)
+            return
+        
+        self._page_cache[page_id] = (last_edited_time, page_data, fetched_at)
+        self._page_cache.move_to_end(page_id)
+        
+        while len(self._page_cache) > self._page_cache_size:
+            self._page_cache.popitem(last=False)
+    
+    def _cache_file(self, name: str) -> Optional[str]:
+        """Location of a persisted cache file, if persistence is enabled"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, name)
+    
+    def _read_json_cache(self, name: str) -> Dict:
+        """Read a persisted cache file, returning {} if missing or unreadable"""
+        path = self._cache_file(name)
+        if not path or not os.path.exists(path):
+            return {}
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to load cache {path}: {e}")
+            return {}
+    
+    def _write_json_cache(self, name: str, data: Dict):
+        """Write a cache file atomically and fsync it"""
+        path = self._cache_file(name)
+        if not path:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save cache {path}: {e}")
+    
+    def _load_page_cache(self):
+        """Load the persisted page cache from a previous run"""
+        for page_id, entry in self._read_json_cache("pages.json").items():
+            # Entries without a fetch time can't be checked for a settled edit time
+            if len(entry) == 3:
+                self._page_cache[page_id] = tuple(entry)
+        
+        while len(self._page_cache) > self._page_cache_size:
+            self._page_cache.popitem(last=False)
+        
+        if self._page_cache:
+            self.logger.debug(f"📦 Loaded {len(self._page_cache)} cached pages")
+    
+    def _save_page_cache(self):
+        """Persist the page cache"""
+        self._write_json_cache("pages.json", dict(self._page_cache))
+    
+    def _load_block_hashes(self):
+        """Load the persisted block hashes from a previous run"""
+        self._block_hashes.update(self._read_json_cache("hashes.json"))
+    
+    def _save_block_hashes(self):
+        """Persist the block hashes"""
+        self._write_json_cache("hashes.json", self._block_hashes)
+    
+    def invalidate(self, page_id: str):
+        """Drop cached content for a page after writing to it"""
+        self._page_cache.pop(page_id, None)
     
     async def get_all_pages(self) -> List[Dict]:
         """Get all pages from configured databases"""
-        all_pages = []
-        
-        for database_id in self.database_ids:
-            pages = await self._get_database_pages(database_id)
-            all_pages.extend(pages)
+        results = await asyncio.gather(*[
+            self._get_database_pages(database_id) for database_id in self.database_ids
+        ])
         
-        return all_pages
+        return [page for pages in results for page in pages]
+    
+    async def iter_all_pages(self) -> AsyncIterator[Dict]:
+        """Yield pages from all configured databases as soon as each one is ready"""
+        queue: asyncio.Queue = asyncio.Queue()
+        producers = [
+            asyncio.ensure_future(self._produce_database_pages(database_id, queue))
+            for database_id in self.database_ids
+        ]
+        try:
+            remaining = len(producers)
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            await self._cancel_all(producers)
+    
+    async def _produce_database_pages(self, database_id: str, queue: asyncio.Queue):
+        """Put a database's pages on queue as they are ready, then an error or None"""
+        fetches = []
+        try:
+            # Cached pages are ready right after the query; the rest as they arrive
+            for row in await self._query_database(database_id):
+                cached = self._get_cached_page(row["id"], row.get("last_edited_time"))
+                if cached is not None:
+                    queue.put_nowait(cached)
+                else:
+                    fetches.append(asyncio.ensure_future(self._get_page_content(row["id"])))
+            
+            for fetch in asyncio.as_completed(fetches):
+                queue.put_nowait(await fetch)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+            queue.put_nowait(None)
     
-    async def _get_database_pages(self, database_id: str) -> List[Dict]:
+    @staticmethod
+    async def _cancel_all(tasks: List[asyncio.Future]):
+        """Cancel tasks and wait for them to finish unwinding"""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _get_database_pages(self, database_id: str, filter_: Optional[Dict] = None) -> List[Dict]:
         """Get all pages from a specific database"""
-        pages = []
+        results = await self._query_database(database_id, filter_=filter_)
+        
+        # Query rows carry last_edited_time, so unchanged pages come straight from cache
+        pages = [
+            self._get_cached_page(page["id"], page.get("last_edited_time"))
+            for page in results
+        ]
+        stale = [i for i, page in enumerate(pages) if page is None]
+        
+        # Get full page content for the rest concurrently
+        fetched = await asyncio.gather(*[
+            self._get_page_content(results[i]["id"]) for i in stale
+        ])
+        for i, page in zip(stale, fetched):
+            pages[i] = page
+        
+        return pages
+    
+    async def _query_database(self, database_id: str, filter_: Optional[Dict] = None,
+                              sorts: Optional[List[Dict]] = None) -> List[Dict]:
+        """Query a database and return the matching rows without block content"""
+        rows = []
         has_more = True
         start_cursor = None
         
@@ -46,41 +342,46 @@ class NotionSyncClient:
                 "page_size": 100
             }
             
+            if filter_:
+                query_data["filter"] = filter_
+            if sorts:
+                query_data["sorts"] = sorts
             if start_cursor:
                 query_data["start_cursor"] = start_cursor
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/databases/{database_id}/query"
+            url = f"{self.base_url}/databases/{database_id}/query"
+            
+            async with self._request("POST", url, json=query_data) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Failed to query database: {error_text}")
                 
-                async with session.post(url, headers=self.headers, json=query_data) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Failed to query database: {error_text}")
-                    
-                    data = await response.json()
-                    
-                    for page in data.get("results", []):
-                        # Get full page content
-                        full_page = await self._get_page_content(page["id"])
-                        pages.append(full_page)
-                    
-                    has_more = data.get("has_more", False)
-                    start_cursor = data.get("next_cursor")
+                data = json_loads(await response.read())
+            
+            rows.extend(data.get("results", []))
+            
+            has_more = data.get("has_more", False)
+            start_cursor = data.get("next_cursor")
         
-        return pages
+        return rows
     
     async def _get_page_content(self, page_id: str) -> Dict:
         """Get full page content including blocks"""
         # Get page metadata
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/pages/{page_id}"
+        url = f"{self.base_url}/pages/{page_id}"
+        fetched_at = time.time()
+        
+        async with self._request("GET", url) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Failed to get page: {error_text}")
             
-            async with session.get(url, headers=self.headers) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to get page: {error_text}")
-                
-                page_data = await response.json()
+            page_data = json_loads(await response.read())
+        
+        # Unchanged since last fetch - reuse cached blocks
+        cached_page = self._get_cached_page(page_id, page_data.get("last_edited_time"))
+        if cached_page is not None:
+            return cached_page
         
         # Get page blocks (content)
         blocks = await self._get_page_blocks(page_id)
@@ -90,10 +391,32 @@ class NotionSyncClient:
         title = self._extract_title(page_data.get("properties", {}))
         page_data["title"] = title
         
+        self._cache_page(page_data, fetched_at)
         return page_data
     
     async def _get_page_blocks(self, page_id: str) -> List[Dict]:
         """Get all blocks (content) from a page"""
+        blocks = await self._get_block_children(page_id)
+        
+        # Fetch nested children one depth level at a time, each level in one batch
+        level = [block for block in blocks if block.get("has_children")]
+        
+        while level:
+            child_lists = await asyncio.gather(*[
+                self._get_block_children(block["id"]) for block in level
+            ])
+            
+            next_level = []
+            for block, child_blocks in zip(level, child_lists):
+                block["children"] = child_blocks
+                next_level.extend(child for child in child_blocks if child.get("has_children"))
+            
+            level = next_level
+        
+        return blocks
+    
+    async def _get_block_children(self, block_id: str) -> List[Dict]:
+        """Get the direct children of a block, following pagination"""
         blocks = []
         has_more = True
         start_cursor = None
@@ -103,26 +426,19 @@ class NotionSyncClient:
             if start_cursor:
                 params["start_cursor"] = start_cursor
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/blocks/{page_id}/children"
+            url = f"{self.base_url}/blocks/{block_id}/children"
+            
+            async with self._request("GET", url, params=params) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Failed to get blocks: {error_text}")
                 
-                async with session.get(url, headers=self.headers, params=params) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Failed to get blocks: {error_text}")
-                    
-                    data = await response.json()
-                    
-                    for block in data.get("results", []):
-                        # Recursively get child blocks if they exist
-                        if block.get("has_children"):
-                            child_blocks = await self._get_page_blocks(block["id"])
-                            block["children"] = child_blocks
-                        
-                        blocks.append(block)
-                    
-                    has_more = data.get("has_more", False)
-                    start_cursor = data.get("next_cursor")
+                data = json_loads(await response.read())
+            
+            blocks.extend(data.get("results", []))
+            
+            has_more = data.get("has_more", False)
+            start_cursor = data.get("next_cursor")
         
         return blocks
     
@@ -143,7 +459,9 @@ class NotionSyncClient:
         existing_page = await self.get_page_by_title(page_data["title"])
         
         if existing_page:
-            return await self._update_page(existing_page["id"], page_data)
+            return await self._update_page(
+                existing_page["id"], page_data, existing_page.get("last_edited_time")
+            )
         else:
             return await self._create_page(page_data)
     
@@ -177,74 +495,126 @@ class NotionSyncClient:
             "properties": properties
         }
         
-        # Add content blocks if provided
-        if "blocks" in page_data:
-            create_data["children"] = page_data["blocks"]
+        # Send as many blocks as fit with the create; append the rest in full batches
+        blocks = page_data.get("blocks") or []
+        if blocks:
+            create_data["children"] = blocks[:self.MAX_BLOCKS_PER_REQUEST]
         
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/pages"
+        url = f"{self.base_url}/pages"
+        
+        async with self._request("POST", url, json=create_data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Failed to create page: {error_text}")
             
-            async with session.post(url, headers=self.headers, json=create_data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to create page: {error_text}")
-                
-                return await response.json()
+            page = json_loads(await response.read())
+        
+        if len(blocks) > self.MAX_BLOCKS_PER_REQUEST:
+            await self._append_blocks(page["id"], blocks[self.MAX_BLOCKS_PER_REQUEST:])
+        
+        return page
     
-    async def _update_page(self, page_id: str, page_data: Dict) -> Dict:
+    async def _update_page(self, page_id: str, page_data: Dict,
+                           last_edited_time: Optional[str] = None) -> Dict:
         """Update an existing page"""
-        # Update properties
+        # Skip the block rewrite when we already wrote these exact blocks and the
+        # page hasn't been edited since (edit time unknown -> trust the hash)
+        blocks_hash = None
+        blocks_unchanged = False
+        if "blocks" in page_data:
+            blocks_hash = self._hash_blocks(page_data["blocks"])
+            blocks_unchanged = self._blocks_unchanged(page_id, blocks_hash, last_edited_time)
+        
+        # Properties and blocks are independent writes, so send them together
+        writes = []
         if "properties" in page_data:
-            update_data = {
-                "properties": page_data["properties"]
+            writes.append(self._update_properties(page_id, page_data["properties"]))
+        
+        if blocks_unchanged:
+            self.logger.debug(f"⏭️ Blocks unchanged for page {page_id}, skipping rewrite")
+        elif "blocks" in page_data:
+            writes.append(self._replace_page_blocks(page_id, page_data["blocks"]))
+        
+        await asyncio.gather(*writes)
+        
+        self.invalidate(page_id)
+        fetched_at = time.time()
+        updated_page = await self._get_page_content(page_id)
+        
+        if blocks_hash is not None:
+            self._block_hashes[page_id] = {
+                "hash": blocks_hash,
+                "last_edited_time": updated_page.get("last_edited_time"),
+                "fetched_at": fetched_at
             }
-            
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/pages/{page_id}"
-                
-                async with session.patch(url, headers=self.headers, json=update_data) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Failed to update page properties: {error_text}")
         
-        # Update content blocks if provided
-        if "blocks" in page_data:
-            await self._replace_page_blocks(page_id, page_data["blocks"])
+        return updated_page
+    
+    def _blocks_unchanged(self, page_id: str, blocks_hash: str, last_edited_time: Optional[str]) -> bool:
+        """Whether the page still holds the blocks we last wrote with this hash"""
+        recorded = self._block_hashes.get(page_id)
+        if recorded is None or recorded["hash"] != blocks_hash:
+            return False
         
-        return await self._get_page_content(page_id)
+        # An edit within the same minute as our write keeps its edit time, so the
+        # recorded time only proves nothing changed once it had settled
+        recorded_time = recorded.get("last_edited_time")
+        if not recorded_time or not _edit_time_settled(recorded_time, recorded.get("fetched_at", 0.0)):
+            return False
+        
+        return last_edited_time is None or recorded_time == last_edited_time
+    
+    async def _update_properties(self, page_id: str, properties: Dict):
+        """Update a page's properties"""
+        update_data = {
+            "properties": properties
+        }
+        
+        url = f"{self.base_url}/pages/{page_id}"
+        
+        async with self._request("PATCH", url, json=update_data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Failed to update page properties: {error_text}")
     
     async def _replace_page_blocks(self, page_id: str, new_blocks: List[Dict]):
         """Replace all blocks in a page with new ones"""
-        # First, delete existing blocks
-        existing_blocks = await self._get_page_blocks(page_id)
+        # First, delete existing top-level blocks (their children go with them)
+        existing_blocks = await self._get_block_children(page_id)
         
-        for block in existing_blocks:
-            await self._delete_block(block["id"])
+        await asyncio.gather(*[
+            self._delete_block(block["id"]) for block in existing_blocks
+        ])
         
         # Then add new blocks
         if new_blocks:
             await self._append_blocks(page_id, new_blocks)
     
+    def _hash_blocks(self, blocks: List[Dict]) -> str:
+        """Stable content hash of a block list"""
+        serialized = json.dumps(blocks, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.blake2b(serialized, digest_size=16).hexdigest()
+    
     async def _delete_block(self, block_id: str):
         """Delete a block"""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/blocks/{block_id}"
-            
-            async with session.delete(url, headers=self.headers) as response:
-                if response.status not in [200, 404]:  # 404 is OK if already deleted
-                    error_text = await response.text()
-                    self.logger.warning(f"Failed to delete block {block_id}: {error_text}")
+        url = f"{self.base_url}/blocks/{block_id}"
+        
+        async with self._request("DELETE", url) as response:
+            if response.status not in [200, 404]:  # 404 is OK if already deleted
+                error_text = await response.text()
+                self.logger.warning(f"Failed to delete block {block_id}: {error_text}")
     
     async def _append_blocks(self, page_id: str, blocks: List[Dict]):
-        """Append blocks to a page"""
-        append_data = {
-            "children": blocks
-        }
+        """Append blocks to a page, as few requests as the API allows"""
+        url = f"{self.base_url}/blocks/{page_id}/children"
         
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/blocks/{page_id}/children"
+        # Batches go out in order so the blocks keep their position
+        for start in range(0, len(blocks), self.MAX_BLOCKS_PER_REQUEST):
+            append_data = {
+                "children": blocks[start:start + self.MAX_BLOCKS_PER_REQUEST]
+            }
             
-            async with session.patch(url, headers=self.headers, json=append_data) as response:
+            async with self._request("PATCH", url, json=append_data) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise Exception(f"Failed to append blocks: {error_text}")
@@ -270,19 +640,18 @@ class NotionSyncClient:
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/databases/{database_id}/query"
+        url = f"{self.base_url}/databases/{database_id}/query"
+        
+        async with self._request("POST", url, json=query_data) as response:
+            if response.status != 200:
+                return None
             
-            async with session.post(url, headers=self.headers, json=query_data) as response:
-                if response.status != 200:
-                    return None
-                
-                data = await response.json()
-                results = data.get("results", [])
-                
-                if results:
-                    # Return first match with full content
-                    return await self._get_page_content(results[0]["id"])
+            data = json_loads(await response.read())
+        
+        results = data.get("results", [])
+        if results:
+            # Return first match with full content
+            return await self._get_page_content(results[0]["id"])
         
         return None
     
@@ -298,17 +667,47 @@ class NotionSyncClient:
             "archived": True
         }
         
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/pages/{page_id}"
-            
-            async with session.patch(url, headers=self.headers, json=update_data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to archive page: {error_text}")
+        url = f"{self.base_url}/pages/{page_id}"
+        
+        async with self._request("PATCH", url, json=update_data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Failed to archive page: {error_text}")
+
+        self.invalidate(page_id)
+        self._block_hashes.pop(page_id, None)
     
     async def get_recent_changes(self, since: datetime) -> List[Dict]:
-        """Get pages that have changed since a specific time"""
-        # This would require implementing change tracking
-        # For now, return all pages and let the sync manager handle comparison
-        return await self.get_all_pages()
-
+        """Get pages that have changed since a specific time (metadata only)"""
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        
+        # Let Notion filter server-side; block content is fetched later via get_page_content
+        filter_ = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {
+                "on_or_after": since.isoformat()
+            }
+        }
+        sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+        
+        changed = []
+        for database_id in self.database_ids:
+            rows = await self._query_database(database_id, filter_=filter_, sorts=sorts)
+            for row in rows:
+                row["title"] = self._extract_title(row.get("properties", {}))
+            changed.extend(rows)
+        
+        return changed
+    
+    async def get_page_ids(self) -> Set[str]:
+        """IDs of all pages in the configured databases (no content fetched)"""
+        results = await asyncio.gather(*[
+            self._query_database(database_id) for database_id in self.database_ids
+        ])
+        
+        return {row["id"] for rows in results for row in rows}
+    
+    async def get_page_content(self, page_id: str) -> Dict:
+        """Get full page content including blocks, served from cache when unchanged"""
+        return await self._get_page_content(page_id)
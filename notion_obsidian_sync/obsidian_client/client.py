@@ -4,17 +4,121 @@ Handles all Obsidian file operations with intelligent link management
 """
 
 import asyncio
+import functools
+import os
+import shutil
+import threading
 import aiofiles
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Set, Tuple, Union
 import re
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+# Characters that are invalid in filenames, mapped to '_'
+_SANITIZE_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Patterns compiled once at import time
+_WIKILINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_TAG_RE = re.compile(r'#([a-zA-Z0-9_-]+)')
+_FRONTMATTER_RE = re.compile(r'\A---\n(.*?)\n---\n', re.DOTALL)
+_SCAN_RE = re.compile(r'\[\[([^\]]+)\]\]|#([a-zA-Z0-9_-]+)|\[([^\]]+)\]\(([^)]+)\)')
+
+# Fast frontmatter path: flat "key: value" lines with plain, quoted, int or [list] values
+_FM_KEY_RE = re.compile(r'[A-Za-z_][\w-]*\Z')
+_FM_INT_RE = re.compile(r'[-+]?(?:0|[1-9][0-9]*)\Z')
+_FM_PLAIN_RE = re.compile(r'[A-Za-z][^:#\[\]{},"\'&*!|>%@`]*\Z')
+_FM_RESERVED = {'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off', 'null'}
+# Whitespace other than plain spaces (tabs, CR, ...), which YAML treats differently
+_FM_ODD_SPACE_RE = re.compile(r'[^\S \n]')
+
+def _fast_scalar(value: str):
+    """Parse a frontmatter scalar the way YAML would, or raise ValueError"""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        inner = value[1:-1]
+        if value[0] in inner or '\\' in inner:
+            raise ValueError(value)
+        return inner
+    if _FM_INT_RE.match(value):
+        return int(value)
+    if _FM_PLAIN_RE.match(value) and value.lower() not in _FM_RESERVED:
+        return value
+    raise ValueError(value)
+
+def _fast_frontmatter(text: str) -> Optional[Dict]:
+    """Parse simple flat frontmatter without YAML; None means fall back to yaml"""
+    if not text.isascii() or _FM_ODD_SPACE_RE.search(text):
+        return None
+    
+    result = {}
+    
+    for line in text.split('\n'):
+        if not line.strip(' '):
+            continue
+        
+        key, sep, value = line.partition(':')
+        if not sep or not _FM_KEY_RE.match(key) or (value and value[0] != ' '):
+            return None
+        # YAML reads keys like 'on' or 'null' as booleans/None too
+        if key.lower() in _FM_RESERVED:
+            return None
+        
+        value = value.strip(' ')
+        try:
+            if not value:
+                result[key] = None
+            elif value[0] == '[' and value[-1] == ']':
+                inner = value[1:-1].strip(' ')
+                result[key] = [_fast_scalar(item.strip(' ')) for item in inner.split(',')] if inner else []
+            else:
+                result[key] = _fast_scalar(value)
+        except ValueError:
+            return None
+    
+    return result
+
+@functools.lru_cache(maxsize=32)
+def _wikilink_alternation(keys: frozenset) -> re.Pattern:
+    """Compile one regex matching only wikilinks whose target is in keys"""
+    # Same targets the generic pattern can match: non-empty, no ']'
+    targets = sorted((key for key in keys if key and ']' not in key), key=len, reverse=True)
+    alternatives = '|'.join(re.escape(key) for key in targets) or '(?!)'
+    return re.compile(r'\[\[(' + alternatives + r')\]\]')
+
+@dataclass
+class ParseResult:
+    """Everything scan() pulls out of a markdown note"""
+    frontmatter: Dict = field(default_factory=dict)
+    body: str = ""
+    wikilinks: Set[str] = field(default_factory=set)
+    tags: Set[str] = field(default_factory=set)
+    markdown_links: List[Tuple[str, str]] = field(default_factory=list)
 
 class ObsidianSyncClient:
     """Enhanced Obsidian client for bidirectional sync operations"""
     
-    def __init__(self, vault_path: str, sync_folder: str = "Notion Sync"):
+    # Patterns for link detection
+    wikilink_pattern = _WIKILINK_RE
+    markdown_link_pattern = _MARKDOWN_LINK_RE
+    
+    # Content at least this long is written to a temp file and renamed into place
+    LARGE_WRITE_THRESHOLD = 1 << 20
+    
+    def __init__(self, vault_path: str, sync_folder: str = "Notion Sync", read_cache_size: int = 256):
         self.vault_path = Path(vault_path)
         self.sync_folder = sync_folder
         self.sync_path = self.vault_path / sync_folder
@@ -23,31 +127,184 @@ class ObsidianSyncClient:
         # Ensure sync folder exists
         self.sync_path.mkdir(parents=True, exist_ok=True)
         
-        # Patterns for link detection
-        self.wikilink_pattern = re.compile(r'\[\[([^\]]+)\]\]')
-        self.markdown_link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+        # File list and lowercased stem -> paths, rebuilt when any vault directory changes
+        self._files_cache: List[Path] = []
+        self._stem_index: Dict[str, List[Path]] = {}
+        self._stem_keys: List[str] = []
+        
+        # LRU of file contents keyed by path, valid while (mtime_ns, size) is unchanged
+        self._read_cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._read_cache_size = read_cache_size
+        self._index_stamps: Optional[Dict[str, int]] = None
     
     def get_all_files(self) -> List[Path]:
         """Get all markdown files in the sync folder"""
-        return list(self.sync_path.glob("**/*.md"))
+        self._refresh_index()
+        return list(self._files_cache)
+    
+    async def iter_all_files(self, batch_size: int = 256) -> AsyncIterator[Path]:
+        """Yield markdown files as the vault walk finds them, without building the full list"""
+        # Nothing changed since the last walk - serve the cached list
+        if self._index_stamps is not None and self._index_is_current():
+            for file_path in list(self._files_cache):
+                yield file_path
+            return
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        stop = threading.Event()
+        
+        walker = loop.run_in_executor(None, self._walk_into_queue, queue, loop, stop, batch_size)
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                for file_path in batch:
+                    yield file_path
+        finally:
+            await self._stop_walker(queue, stop, walker)
+    
+    def _walk_into_queue(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop,
+                         stop: threading.Event, batch_size: int):
+        """Feed batches of markdown paths to queue from a worker thread, then None"""
+        def put(item):
+            # Blocks on the bounded queue for backpressure
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        
+        batch: List[Path] = []
+        try:
+            for entry in self._scan_markdown_files():
+                if stop.is_set():
+                    return
+                batch.append(Path(entry.path))
+                if len(batch) >= batch_size:
+                    put(batch)
+                    batch = []
+        finally:
+            if not stop.is_set():
+                put(batch)
+                put(None)
+    
+    @staticmethod
+    async def _stop_walker(queue: asyncio.Queue, stop: threading.Event, walker: asyncio.Future):
+        """Let the walker exit instead of blocking on a full queue, then wait for it"""
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
+        await walker
+    
+    def _scan_markdown_files(self, directory: Optional[Path] = None,
+                             dir_stamps: Optional[Dict[str, int]] = None) -> Iterator[os.DirEntry]:
+        """Walk the sync folder once, yielding markdown entries with cached stat"""
+        directory = directory or self.sync_path
+        try:
+            if dir_stamps is not None:
+                dir_stamps[str(directory)] = os.stat(directory).st_mtime_ns
+            
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Symlinked directories aren't followed: they can loop or leave the vault
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._scan_markdown_files(entry.path, dir_stamps)
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        yield entry
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            # One unreadable subtree shouldn't abort the whole scan
+            self.logger.warning(f"⚠️ Skipping {directory}: {e}")
     
     async def read_file(self, file_path: Path) -> str:
         """Read content from a markdown file"""
         try:
+            key = str(file_path)
+            stamp = self._file_stamp(file_path)
+            
+            # Unchanged on disk since last read/write - skip reopening the file
+            cached = self._read_cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                self._read_cache.move_to_end(key)
+                return cached[1]
+            
             async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                content = await f.read()
+            
+            self._remember_content(key, stamp, content)
+            return content
+        except Exception as e:
+            self.logger.error(f"Failed to read file {file_path}: {e}")
+            raise
+    
+    async def read_files(self, file_paths: List[Path]) -> Dict[Path, str]:
+        """Read many files in one worker-thread hop and keep them in the read cache"""
+        # Beyond the cache size the first reads would be evicted before they're used
+        file_paths = file_paths[:self._read_cache_size]
+        
+        def read_all() -> Dict[Path, Tuple[Tuple[int, int], str]]:
+            results = {}
+            for file_path in file_paths:
+                try:
+                    stamp = self._file_stamp(file_path)
+                    cached = self._read_cache.get(str(file_path))
+                    if cached is not None and cached[0] == stamp:
+                        results[file_path] = cached
+                        continue
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        results[file_path] = (stamp, f.read())
+                except (OSError, UnicodeDecodeError) as e:
+                    # Left out; a later read_file reports the error for this file
+                    self.logger.debug(f"Skipping batch read of {file_path}: {e}")
+            return results
+        
+        results = await asyncio.to_thread(read_all)
+        for file_path, (stamp, content) in results.items():
+            self._remember_content(str(file_path), stamp, content)
+        
+        return {file_path: content for file_path, (_, content) in results.items()}
+    
+    async def read_file_bytes(self, file_path: Path) -> bytes:
+        """Read raw bytes from a markdown file, leaving decoding to the caller"""
+        try:
+            async with aiofiles.open(file_path, 'rb') as f:
                 return await f.read()
         except Exception as e:
             self.logger.error(f"Failed to read file {file_path}: {e}")
             raise
     
+    async def read_file_chunks(self, file_path: Path, chunk_size: int = 64 * 1024,
+                               binary: bool = False) -> AsyncIterator[Union[str, bytes]]:
+        """Read a markdown file in bounded chunks for scan-only pipelines"""
+        try:
+            if binary:
+                opener = aiofiles.open(file_path, 'rb')
+            else:
+                opener = aiofiles.open(file_path, 'r', encoding='utf-8')
+            
+            async with opener as f:
+                while True:
+                    chunk = await f.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        except Exception as e:
+            self.logger.error(f"Failed to read file {file_path}: {e}")
+            raise
+    
     async def write_file(self, file_path: Path, content: str):
         """Write content to a markdown file"""
         try:
             # Ensure parent directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+            if len(content) >= self.LARGE_WRITE_THRESHOLD:
+                await asyncio.to_thread(self._write_file_atomic, file_path, content)
+            else:
+                async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+                    await f.write(content)
+            
+            self._remember_content(str(file_path), self._file_stamp(file_path), content)
+            self._invalidate_index()
                 
             self.logger.debug(f"✅ Wrote file: {file_path}")
             
@@ -55,16 +312,46 @@ class ObsidianSyncClient:
             self.logger.error(f"Failed to write file {file_path}: {e}")
             raise
     
+    def _write_file_atomic(self, file_path: Path, content: str):
+        """Write through a temp file renamed into place, so readers never see a partial file"""
+        tmp_path = file_path.with_name(file_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if file_path.exists():
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     async def delete_file(self, file_path: Path):
         """Delete a markdown file"""
         try:
             if file_path.exists():
                 file_path.unlink()
+                self._read_cache.pop(str(file_path), None)
+                self._invalidate_index()
                 self.logger.debug(f"🗑️ Deleted file: {file_path}")
         except Exception as e:
             self.logger.error(f"Failed to delete file {file_path}: {e}")
             raise
     
+    def _file_stamp(self, file_path: Path) -> Tuple[int, int]:
+        """Cheap change marker for a file: (mtime_ns, size)"""
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _remember_content(self, key: str, stamp: Tuple[int, int], content: str):
+        """Store file content in the read cache, evicting least recently used"""
+        self._read_cache[key] = (stamp, content)
+        self._read_cache.move_to_end(key)
+        
+        while len(self._read_cache) > self._read_cache_size:
+            self._read_cache.popitem(last=False)
+    
     def get_file_path(self, title: str) -> Path:
         """Get the file path for a given title"""
         # Sanitize title for filename
@@ -73,45 +360,50 @@ class ObsidianSyncClient:
     
     def _sanitize_filename(self, title: str) -> str:
         """Convert title to safe filename"""
-        # Remove or replace invalid characters
-        safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
-        safe_title = safe_title.strip()
+        # Replace invalid characters, then limit length
+        safe_title = title.translate(_SANITIZE_TRANS).strip()
+        return safe_title[:200] or "Untitled"
+    
+    def extract_frontmatter(self, content: Union[str, bytes]) -> tuple[Dict, str]:
+        """Extract YAML frontmatter from markdown content"""
+        if isinstance(content, bytes):
+            return self.extract_frontmatter_bytes(content)
         
-        # Limit length
-        if len(safe_title) > 200:
-            safe_title = safe_title[:200]
+        match = _FRONTMATTER_RE.match(content)
+        if not match:
+            return {}, content
         
-        return safe_title or "Untitled"
+        return self._parse_frontmatter(match.group(1)), content[match.end():]
     
-    def extract_frontmatter(self, content: str) -> tuple[Dict, str]:
-        """Extract YAML frontmatter from markdown content"""
-        frontmatter = {}
-        body = content
+    def extract_frontmatter_bytes(self, data: bytes) -> tuple[Dict, str]:
+        """Split frontmatter on raw bytes, decoding only the two halves"""
+        if not data.startswith(b'---\n'):
+            return {}, data.decode('utf-8')
         
-        if content.startswith('---\n'):
-            try:
-                # Find end of frontmatter
-                end_index = content.find('\n---\n', 4)
-                if end_index != -1:
-                    frontmatter_text = content[4:end_index]
-                    body = content[end_index + 5:]
-                    
-                    # Parse YAML frontmatter
-                    import yaml
-                    frontmatter = yaml.safe_load(frontmatter_text) or {}
-                    
-            except Exception as e:
-                self.logger.warning(f"Failed to parse frontmatter: {e}")
-        
-        return frontmatter, body
+        end_index = data.find(b'\n---\n', 4)
+        if end_index == -1:
+            return {}, data.decode('utf-8')
+        
+        frontmatter_text = data[4:end_index].decode('utf-8')
+        return self._parse_frontmatter(frontmatter_text), data[end_index + 5:].decode('utf-8')
+    
+    def _parse_frontmatter(self, frontmatter_text: str) -> Dict:
+        """Parse frontmatter text, skipping the YAML parser for simple flat headers"""
+        try:
+            frontmatter = _fast_frontmatter(frontmatter_text)
+            if frontmatter is None:
+                self.logger.debug("Frontmatter needs full YAML parser")
+                frontmatter = yaml.load(frontmatter_text, Loader=SafeLoader) or {}
+            return frontmatter
+        except Exception as e:
+            self.logger.warning(f"Failed to parse frontmatter: {e}")
+            return {}
     
     def add_frontmatter(self, content: str, metadata: Dict) -> str:
         """Add YAML frontmatter to markdown content"""
         if not metadata:
             return content
         
-        import yaml
-        
         # Extract existing frontmatter
         existing_frontmatter, body = self.extract_frontmatter(content)
         
@@ -119,16 +411,37 @@ class ObsidianSyncClient:
         existing_frontmatter.update(metadata)
         
         # Generate new frontmatter
-        frontmatter_yaml = yaml.dump(existing_frontmatter, default_flow_style=False)
+        frontmatter_yaml = yaml.dump(existing_frontmatter, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
         
         return f"---\n{frontmatter_yaml}---\n{body}"
     
+    def scan(self, content: str) -> ParseResult:
+        """Extract frontmatter, wikilinks, tags and markdown links in a single pass"""
+        frontmatter, body = self.extract_frontmatter(content)
+        result = ParseResult(frontmatter=frontmatter, body=body)
+        
+        for match in _SCAN_RE.finditer(body):
+            wikilink, tag, link_text, link_url = match.groups()
+            if wikilink is not None:
+                result.wikilinks.add(wikilink)
+            elif tag is not None:
+                result.tags.add(tag)
+            else:
+                result.markdown_links.append((link_text, link_url))
+        
+        return result
+    
     def extract_wikilinks(self, content: str) -> Set[str]:
         """Extract all wikilinks from content"""
         return set(self.wikilink_pattern.findall(content))
     
     def convert_wikilinks_to_markdown(self, content: str, link_mapping: Dict[str, str]) -> str:
         """Convert wikilinks to markdown links using provided mapping"""
+        # Large maps: match only mapped targets so every hit is a plain lookup
+        if len(link_mapping) > 8:
+            pattern = _wikilink_alternation(frozenset(link_mapping))
+            return pattern.sub(lambda m: f"[{m.group(1)}]({link_mapping[m.group(1)]})", content)
+        
         def replace_link(match):
             link_text = match.group(1)
             if link_text in link_mapping:
@@ -153,15 +466,15 @@ class ObsidianSyncClient:
     
     def extract_tags(self, content: str) -> Set[str]:
         """Extract hashtags from content"""
-        tag_pattern = re.compile(r'#([a-zA-Z0-9_-]+)')
-        return set(tag_pattern.findall(content))
+        return set(_TAG_RE.findall(content))
     
     def get_file_stats(self, file_path: Path) -> Dict:
         """Get file statistics"""
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             return {}
         
-        stat = file_path.stat()
         return {
             'size': stat.st_size,
             'created': datetime.fromtimestamp(stat.st_ctime),
@@ -177,8 +490,9 @@ class ObsidianSyncClient:
         backup_path = file_path.with_suffix(f'.backup.{datetime.now().strftime("%Y%m%d_%H%M%S")}.md')
         
         try:
-            content = await self.read_file(file_path)
-            await self.write_file(backup_path, content)
+            # copyfile uses os.sendfile where available, so content never passes through Python
+            await asyncio.to_thread(shutil.copyfile, file_path, backup_path)
+            self._invalidate_index()
             return backup_path
         except Exception as e:
             self.logger.error(f"Failed to backup file {file_path}: {e}")
@@ -193,44 +507,120 @@ class ObsidianSyncClient:
         if exact_path.exists():
             return [exact_path]
         
-        # Fuzzy search
+        # Fuzzy search over the stem index
+        self._refresh_index()
+        needle = safe_title.lower()
+        
+        if process is not None:
+            stems = [
+                stem for stem, _, _ in process.extract(
+                    needle, self._stem_keys, scorer=fuzz.partial_ratio, limit=10, score_cutoff=80
+                )
+            ]
+        else:
+            stems = [stem for stem in self._stem_keys if needle in stem]
+        
         matches = []
-        for file_path in self.get_all_files():
-            if safe_title.lower() in file_path.stem.lower():
-                matches.append(file_path)
+        for stem in stems:
+            matches.extend(self._stem_index[stem])
         
         return matches
     
+    def _refresh_index(self):
+        """Rebuild the file list and stem index if any directory in the sync folder changed"""
+        if self._index_stamps is not None and self._index_is_current():
+            return
+        
+        stamps: Dict[str, int] = {}
+        files: List[Path] = []
+        index: Dict[str, List[Path]] = {}
+        for entry in self._scan_markdown_files(dir_stamps=stamps):
+            path = Path(entry.path)
+            files.append(path)
+            index.setdefault(path.stem.lower(), []).append(path)
+        
+        self._files_cache = files
+        self._stem_index = index
+        self._stem_keys = list(index)
+        self._index_stamps = stamps
+    
+    def _index_is_current(self) -> bool:
+        """Check recorded directory mtimes against the filesystem"""
+        try:
+            return all(
+                os.stat(directory).st_mtime_ns == mtime
+                for directory, mtime in self._index_stamps.items()
+            )
+        except FileNotFoundError:
+            return False
+    
+    def _invalidate_index(self):
+        """Force the file list and stem index to rebuild on next lookup"""
+        self._index_stamps = None
+    
     async def get_all_links(self) -> Dict[str, Set[str]]:
         """Get all links from all files in the sync folder"""
         all_links = {}
         
-        for file_path in self.get_all_files():
-            try:
-                content = await self.read_file(file_path)
-                links = self.extract_wikilinks(content)
-                all_links[file_path.stem] = links
-            except Exception as e:
-                self.logger.error(f"Failed to extract links from {file_path}: {e}")
+        files = self.get_all_files()
+        contents = await asyncio.gather(
+            *[self.read_file(file_path) for file_path in files],
+            return_exceptions=True
+        )
+        
+        for file_path, content in zip(files, contents):
+            if isinstance(content, Exception):
+                self.logger.error(f"Failed to extract links from {file_path}: {content}")
+                continue
+            
+            all_links[file_path.stem] = self.extract_wikilinks(content)
         
         return all_links
     
     async def update_link_references(self, old_title: str, new_title: str):
         """Update all references to a renamed file"""
-        old_link = f"[[{old_title}]]"
-        new_link = f"[[{new_title}]]"
+        old_link = f"[[{old_title}]]".encode('utf-8')
+        new_link = f"[[{new_title}]]".encode('utf-8')
         
-        for file_path in self.get_all_files():
+        # Byte-level pre-filter off the event loop; only matching files are decoded
+        candidates = await asyncio.to_thread(self._find_files_containing, old_link)
+        
+        updates = []
+        for file_path, data in candidates:
             try:
-                content = await self.read_file(file_path)
-                
-                if old_link in content:
-                    updated_content = content.replace(old_link, new_link)
-                    await self.write_file(file_path, updated_content)
-                    self.logger.debug(f"Updated links in {file_path}")
-                    
-            except Exception as e:
+                # Normalize newlines like a text-mode read; write_file translates '\n' back
+                content = data.replace(old_link, new_link).decode('utf-8').replace('\r\n', '\n')
+                updates.append((file_path, content))
+            except UnicodeDecodeError as e:
                 self.logger.error(f"Failed to update links in {file_path}: {e}")
+        
+        results = await asyncio.gather(
+            *[self.write_file(file_path, content) for file_path, content in updates],
+            return_exceptions=True
+        )
+        
+        for (file_path, _), result in zip(updates, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to update links in {file_path}: {result}")
+            else:
+                self.logger.debug(f"Updated links in {file_path}")
+    
+    def _find_files_containing(self, needle: bytes) -> List[tuple[Path, bytes]]:
+        """Return (path, raw bytes) for markdown files whose bytes contain needle"""
+        matches = []
+        
+        for entry in self._scan_markdown_files():
+            try:
+                with open(entry.path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                self.logger.error(f"Failed to update links in {entry.path}: {e}")
+                continue
+            
+            if needle in data:
+                matches.append((Path(entry.path), data))
+        
+        return matches
     
     def get_orphaned_files(self) -> List[Path]:
         """Find files that aren't linked to by any other file"""
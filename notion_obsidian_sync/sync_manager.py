@@ -6,11 +6,29 @@ Invisible intelligence for seamless knowledge management
 
 import asyncio
 import argparse
+import hashlib
 import logging
+import os
+import shutil
+import signal
+import sqlite3
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from notion_client.client import NotionSyncClient
 from obsidian_client.client import ObsidianSyncClient
 from converters.notion_to_obsidian import NotionToObsidianConverter
@@ -19,6 +37,170 @@ from conflict_resolver.resolver import ConflictResolver
 from watchers.file_watcher import FileWatcher
 from watchers.notion_watcher import NotionWatcher
 
+# Parsed configs keyed by (absolute path, mtime) so re-instantiation skips parsing
+_CONFIG_CACHE: Dict[Tuple[str, float], Dict] = {}
+
+async def run_together(*aws: Awaitable) -> List[Any]:
+    """Run awaitables concurrently; the first failure cancels the others"""
+    if hasattr(asyncio, 'TaskGroup'):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+        return [task.result() for task in tasks]
+    
+    # Before 3.11: same semantics on top of gather
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+class RequestDeduplicator:
+    """Share one in-flight (or recently finished) result between identical requests"""
+    
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, asyncio.Future]] = {}
+    
+    async def dedupe(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the shared result for key, starting the request if needed"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            started, future = entry
+            if not future.done() or time.monotonic() - started < self.ttl:
+                return await asyncio.shield(future)
+        
+        future = asyncio.ensure_future(factory())
+        self._entries[key] = (time.monotonic(), future)
+        
+        # Drop the entry (and the result it holds) once it can no longer be shared
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_later(self.ttl, self._expire, key, future))
+        
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # Don't hand a failure to later callers - let them retry
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+    
+    def invalidate(self, key: str):
+        """Forget the shared result for key"""
+        self._entries.pop(key, None)
+    
+    def _expire(self, key: str, future: asyncio.Future):
+        """Forget key if it still holds this (now stale) result"""
+        if self._entries.get(key, (None, None))[1] is future:
+            del self._entries[key]
+
+class TTLCache:
+    """Small LRU cache whose entries also expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int = 2048, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh value for key, or None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        
+        stored, value = entry
+        if time.monotonic() - stored >= self.ttl:
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any):
+        """Store value for key, evicting the least recently used entries"""
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: str):
+        """Forget key"""
+        self._data.pop(key, None)
+
+class SyncManifest:
+    """Per-item record of the last successful sync, used to skip unchanged items"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            page_id TEXT PRIMARY KEY,
+            title TEXT,
+            path TEXT,
+            notion_last_edited TEXT,
+            vault_mtime_ns INTEGER,
+            content_hash TEXT
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS items_title ON items(title);
+        CREATE INDEX IF NOT EXISTS items_path ON items(path);
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        
+        # One row per item in SQLite/WAL, so each update writes only that row
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+    
+    def close(self):
+        """Close the database"""
+        self._db.close()
+    
+    def get(self, page_id: str) -> Optional[Dict]:
+        """Entry for a Notion page"""
+        row = self._db.execute("SELECT * FROM items WHERE page_id = ?", (page_id,)).fetchone()
+        return dict(row) if row else None
+    
+    def get_by_path(self, file_path: Path) -> Optional[Dict]:
+        """Entry for a vault file"""
+        row = self._db.execute("SELECT * FROM items WHERE path = ?", (str(file_path),)).fetchone()
+        return dict(row) if row else None
+    
+    def record(self, page_id: str, title: str, notion_last_edited: Optional[str],
+               file_path: Path, vault_mtime_ns: int, content_hash: str):
+        """Remember the state of both sides after a successful sync"""
+        path = str(file_path)
+        self._db.execute("DELETE FROM items WHERE path = ? AND page_id != ?", (path, page_id))
+        self._db.execute(
+            """
+            INSERT INTO items (page_id, title, path, notion_last_edited, vault_mtime_ns, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(page_id) DO UPDATE SET
+                title = excluded.title,
+                path = excluded.path,
+                notion_last_edited = excluded.notion_last_edited,
+                vault_mtime_ns = excluded.vault_mtime_ns,
+                content_hash = excluded.content_hash
+            """,
+            (page_id, title, path, notion_last_edited, vault_mtime_ns, content_hash)
+        )
+    
+    def touch(self, file_path: Path, vault_mtime_ns: int):
+        """Update the recorded mtime of a vault file whose content is unchanged"""
+        self._db.execute(
+            "UPDATE items SET vault_mtime_ns = ? WHERE path = ?", (vault_mtime_ns, str(file_path))
+        )
+    
+    def remove_path(self, file_path: Path):
+        """Forget the entry for a deleted vault file"""
+        self._db.execute("DELETE FROM items WHERE path = ?", (str(file_path),))
+
 class SyncManager:
     """Main orchestrator for bidirectional sync between Notion and Obsidian"""
     
@@ -29,7 +211,10 @@ class SyncManager:
         # Initialize clients
         self.notion_client = NotionSyncClient(
             token=self.config['notion']['token'],
-            database_ids=self.config['notion']['database_ids']
+            database_ids=self.config['notion']['database_ids'],
+            rate_limit=self.config['notion'].get('rate_limit', 3),
+            max_concurrency=self.config['notion'].get('max_concurrency', 8),
+            cache_dir=self.config['notion'].get('cache_dir')
         )
         
         self.obsidian_client = ObsidianSyncClient(
@@ -45,21 +230,85 @@ class SyncManager:
         self.conflict_resolver = ConflictResolver(self.config)
         
         # Initialize watchers
+        watcher_config = self.config.get('watchers', {})
         self.file_watcher = FileWatcher(
             self.obsidian_client.sync_path,
-            self._on_obsidian_change
+            self._on_obsidian_changes,
+            poll_interval=watcher_config.get('poll_interval', 30),
+            use_polling=watcher_config.get('use_polling'),
+            debounce=self.config.get('sync', {}).get('debounce', 0.5)
         )
         self.notion_watcher = NotionWatcher(
             self.notion_client,
-            self._on_notion_change
+            self._on_notion_change,
+            webhook_config=self.config['notion'].get('webhook')
+        )
+        
+        # Number of items in flight during full syncs; each resource has its own bound
+        # below (Notion requests are bounded and rate limited inside the client)
+        self._max_concurrent = self.config.get('sync', {}).get('max_concurrent', 20)
+        self._fs_sem = asyncio.Semaphore(self.config['obsidian'].get('max_concurrency', 64))
+        
+        # Keeps both sync directions off the same item at the same time
+        self._title_locks: Dict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
+        # Collapses concurrent identical Notion lookups into one request
+        self._dedup = RequestDeduplicator()
+        
+        # Recently seen Notion page metadata by title, so conflict checks can skip the API
+        self._page_meta_cache = TTLCache(maxsize=2048, ttl=60.0)
+        
+        # Content digests of vault files: path -> ((mtime_ns, size), digest)
+        self._file_digests: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+        
+        # Conflicts are queued and resolved together once per batch window
+        self._conflict_queue: asyncio.Queue = asyncio.Queue()
+        self._conflict_window = self.config.get('conflict_resolution', {}).get('batch_window', 2.0)
+        self._conflict_task: Optional[asyncio.Task] = None
+        # Conflicts taken off the queue but not yet resolved (kept for the shutdown drain)
+        self._conflict_batch: List[Dict] = []
+        
+        # Set (e.g. from a signal handler) to end a watch session
+        self._stop_event = asyncio.Event()
+        
+        # Last synced state per item, so re-runs skip what hasn't changed on either side
+        manifest_path = self.config.get('sync', {}).get('manifest_path')
+        self.manifest = SyncManifest(
+            Path(os.path.expanduser(manifest_path)) if manifest_path
+            else self._default_manifest_path()
         )
         
         self.logger = logging.getLogger(__name__)
     
+    def _default_manifest_path(self) -> Path:
+        """Manifest location outside the vault, one per sync folder"""
+        # Inside the vault, sync services would replicate the database and its WAL files,
+        # and WAL doesn't work on the network mounts a vault may live on
+        cache_dir = self.config['notion'].get('cache_dir') or os.path.join(
+            os.environ.get('XDG_CACHE_HOME', '~/.cache'), 'notion_sync'
+        )
+        sync_path = self.obsidian_client.sync_path
+        vault_key = hashlib.blake2b(str(sync_path.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+        path = Path(os.path.expanduser(cache_dir)) / f"sync_state-{vault_key}.db"
+        
+        # Carry over a manifest from the old in-vault location
+        legacy_path = sync_path / '.sync_state.db'
+        if legacy_path.exists() and not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for suffix in ('', '-wal', '-shm'):
+                legacy_file = Path(f"{legacy_path}{suffix}")
+                if legacy_file.exists():
+                    shutil.move(str(legacy_file), f"{path}{suffix}")
+        
+        return path
+    
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        cache_key = (os.path.abspath(config_path), os.path.getmtime(config_path))
+        if cache_key not in _CONFIG_CACHE:
+            with open(config_path, 'r') as f:
+                _CONFIG_CACHE[cache_key] = yaml.load(f, Loader=SafeLoader)
+        return _CONFIG_CACHE[cache_key]
     
     def setup_logging(self):
         """Configure logging"""
@@ -72,11 +321,12 @@ class SyncManager:
         """Perform initial bidirectional sync"""
         self.logger.info("🚀 Starting initial bidirectional sync...")
         
-        # Sync Notion → Obsidian
-        await self._sync_notion_to_obsidian()
-        
-        # Sync Obsidian → Notion  
-        await self._sync_obsidian_to_notion()
+        # Notion → Obsidian and Obsidian → Notion overlap; per-item locks keep them apart
+        await run_together(
+            self._sync_notion_to_obsidian(),
+            self._sync_obsidian_to_notion()
+        )
+        self._title_locks.clear()
         
         self.logger.info("✅ Initial sync completed!")
     
@@ -84,67 +334,264 @@ class SyncManager:
         """Sync all Notion pages to Obsidian"""
         self.logger.info("📥 Syncing Notion → Obsidian...")
         
-        # Get all pages from configured databases
-        pages = await self.notion_client.get_all_pages()
+        # Start converting each page as soon as it arrives from any database
+        pages = []
+        tasks = []
+        try:
+            async for page in self.notion_client.iter_all_pages():
+                self._remember_page_meta(page)
+                pages.append(page)
+                tasks.append(asyncio.ensure_future(self._sync_page_to_obsidian(page)))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
         
-        for page in pages:
-            try:
-                # Convert Notion page to Obsidian markdown
-                markdown_content = await self.notion_to_obsidian.convert(page)
-                
-                # Write to Obsidian vault
-                file_path = self.obsidian_client.get_file_path(page['title'])
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for page, result in zip(pages, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ Failed to sync {page['title']}: {result}")
+    
+    async def _sync_page_to_obsidian(self, page: Dict):
+        """Convert one Notion page and write it to the vault"""
+        file_path = self.obsidian_client.get_file_path(page['title'])
+        
+        async with self._title_locks[file_path]:
+            # Unchanged in Notion since the last sync (or just pushed from the vault): the
+            # vault copy is either identical or a newer local edit for the other direction
+            entry = self.manifest.get(page['id'])
+            if (entry is not None and entry['notion_last_edited'] is not None
+                    and entry['notion_last_edited'] >= (page.get('last_edited_time') or '')
+                    and entry['path'] == str(file_path) and file_path.exists()):
+                self.logger.debug(f"⏭️ Unchanged: {page['title']}")
+                return
+            
+            # Convert Notion page to Obsidian markdown
+            markdown_content = await self.notion_to_obsidian.convert(page)
+            
+            # Also edited in the vault since the last sync: resolve instead of overwriting,
+            # whichever direction reaches the item first
+            if (self._mtime_ns(file_path) is not None
+                    and not self._file_unchanged_since_sync(file_path)):
+                async with self._fs_sem:
+                    content = await self.obsidian_client.read_file(file_path)
+                if content != markdown_content and not self._content_matches_sync(file_path, content):
+                    notion_data = await self.obsidian_to_notion.convert(content, file_path)
+                    await self._resolve_both_sides(file_path, content, notion_data, page, markdown_content)
+                    return
+            
+            # Write to Obsidian vault
+            async with self._fs_sem:
                 await self.obsidian_client.write_file(file_path, markdown_content)
-                
-                self.logger.debug(f"✅ Synced: {page['title']}")
-                
-            except Exception as e:
-                self.logger.error(f"❌ Failed to sync {page['title']}: {e}")
+            self._record_sync(page, file_path, markdown_content)
+            
+            self.logger.debug(f"✅ Synced: {page['title']}")
     
     async def _sync_obsidian_to_notion(self):
         """Sync all Obsidian files to Notion"""
         self.logger.info("📤 Syncing Obsidian → Notion...")
         
-        # Get all markdown files in sync folder
-        files = self.obsidian_client.get_all_files()
+        # Stream files from the vault walk into a bounded pool of workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_concurrent * 2)
+        workers = [
+            asyncio.ensure_future(self._file_sync_worker(queue))
+            for _ in range(self._max_concurrent)
+        ]
         
-        for file_path in files:
+        try:
+            async for file_path in self.obsidian_client.iter_all_files():
+                await queue.put(file_path)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _file_sync_worker(self, queue: asyncio.Queue):
+        """Sync files from the queue until cancelled"""
+        while True:
+            file_path = await queue.get()
             try:
-                # Read markdown content
-                content = await self.obsidian_client.read_file(file_path)
-                
-                # Convert to Notion format
-                notion_data = await self.obsidian_to_notion.convert(content, file_path)
-                
-                # Create or update in Notion
-                await self.notion_client.create_or_update_page(notion_data)
-                
-                self.logger.debug(f"✅ Synced: {file_path.name}")
-                
+                await self._sync_file_to_notion(file_path)
             except Exception as e:
                 self.logger.error(f"❌ Failed to sync {file_path.name}: {e}")
+            finally:
+                queue.task_done()
+    
+    async def _sync_file_to_notion(self, file_path: Path):
+        """Convert one vault file and create or update its Notion page"""
+        async with self._title_locks[file_path]:
+            if self._file_unchanged_since_sync(file_path):
+                self.logger.debug(f"⏭️ Unchanged: {file_path.name}")
+                return
+            
+            # Read markdown content
+            async with self._fs_sem:
+                content = await self.obsidian_client.read_file(file_path)
+            if self._content_matches_sync(file_path, content):
+                return
+            
+            # Convert to Notion format
+            notion_data = await self.obsidian_to_notion.convert(content, file_path)
+            
+            # Also edited in Notion since the last sync (and not pulled yet): pushing
+            # would overwrite that edit, so resolve it as a conflict
+            notion_page = await self._notion_edit_since_sync(file_path, notion_data['title'])
+            if notion_page is not None:
+                markdown_content = await self.notion_to_obsidian.convert(notion_page)
+                await self._resolve_both_sides(file_path, content, notion_data, notion_page, markdown_content)
+                return
+            
+            # Create or update in Notion
+            page = await self.notion_client.create_or_update_page(notion_data)
+            self._forget_page(notion_data['title'])
+            self._record_sync(dict(page, title=notion_data['title']), file_path, content)
+            
+            self.logger.debug(f"✅ Synced: {file_path.name}")
     
-    async def _on_obsidian_change(self, file_path: Path, event_type: str):
-        """Handle Obsidian file changes"""
+    async def _notion_edit_since_sync(self, file_path: Path, title: str) -> Optional[Dict]:
+        """The Notion page for title, if it exists and changed after the last sync of file_path"""
+        entry = self.manifest.get_by_path(file_path)
+        
+        def synced(page_id: Optional[str], last_edited_time: Optional[str]) -> bool:
+            return (entry is not None and entry['page_id'] == page_id
+                    and entry['notion_last_edited'] is not None
+                    and entry['notion_last_edited'] >= (last_edited_time or ''))
+        
+        # Page metadata seen recently (e.g. while listing pages) avoids the lookup
+        meta = self._page_meta_cache.get(title)
+        if meta is not None and synced(meta['id'], meta['last_edited_time']):
+            return None
+        
+        page = await self._dedup.dedupe(
+            f"page_by_title:{title}",
+            lambda: self.notion_client.get_page_by_title(title)
+        )
+        if not page:
+            return None
+        
+        self._remember_page_meta(page)
+        return None if synced(page.get('id'), page.get('last_edited_time')) else page
+    
+    async def _resolve_both_sides(self, file_path: Path, content: str, notion_data: Dict,
+                                  page: Dict, markdown_content: str):
+        """Resolve an item edited in both the vault and Notion since the last sync"""
+        self.logger.info(f"⚖️ Edited on both sides: {page['title']}")
+        await self._resolve_conflict_batch([
+            {
+                'side': 'obsidian',
+                'title': page['title'],
+                'file_path': file_path,
+                'data': notion_data,
+                'content': content
+            },
+            {
+                'side': 'notion',
+                'title': page['title'],
+                'file_path': file_path,
+                'data': markdown_content,
+                'page': page
+            }
+        ])
+    
+    def _mtime_ns(self, file_path: Path) -> Optional[int]:
+        """File mtime in ns, or None if it doesn't exist"""
+        try:
+            return file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _content_hash(self, content: str) -> str:
+        """Digest used to compare item content across syncs"""
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _file_unchanged_since_sync(self, file_path: Path) -> bool:
+        """True if the vault file hasn't been touched since it was last synced"""
+        entry = self.manifest.get_by_path(file_path)
+        return entry is not None and entry['vault_mtime_ns'] == self._mtime_ns(file_path)
+    
+    def _file_holds(self, file_path: Path, content: str) -> bool:
+        """True if the file is untouched since a sync that wrote exactly this content"""
+        entry = self.manifest.get_by_path(file_path)
+        return (entry is not None and entry['content_hash'] == self._content_hash(content)
+                and entry['vault_mtime_ns'] == self._mtime_ns(file_path))
+    
+    def _content_matches_sync(self, file_path: Path, content: str) -> bool:
+        """True if the file was touched but its content is what was last synced"""
+        entry = self.manifest.get_by_path(file_path)
+        if entry is None or entry['content_hash'] != self._content_hash(content):
+            return False
+        
+        # Same content: refresh the mtime so the next check is a single stat
+        self.manifest.touch(file_path, self._mtime_ns(file_path))
+        return True
+    
+    def _record_sync(self, page: Dict, file_path: Path, content: str):
+        """Record a successful sync of page <-> file in the manifest"""
+        page_id = page.get('id')
+        if not page_id:
+            return
+        
+        self.manifest.record(
+            page_id, page['title'], page.get('last_edited_time'),
+            file_path, self._mtime_ns(file_path), self._content_hash(content)
+        )
+    
+    async def _on_obsidian_changes(self, changes: List[Tuple[Path, str]]):
+        """Handle a debounced batch of Obsidian file changes (one entry per path)"""
+        # Read every file that really changed in one go; the per-file syncs below
+        # then get their content from the read cache
+        changed = [
+            file_path for file_path, event_type in changes
+            if event_type != 'deleted' and not self._file_unchanged_since_sync(file_path)
+        ]
+        if changed:
+            await self.obsidian_client.read_files(changed)
+        
+        await asyncio.gather(*[
+            self._do_obsidian_sync(file_path, event_type) for file_path, event_type in changes
+        ])
+    
+    async def _do_obsidian_sync(self, file_path: Path, event_type: str):
+        """Sync one changed Obsidian file to Notion"""
         self.logger.info(f"📝 Obsidian change detected: {file_path.name} ({event_type})")
         
         try:
             if event_type in ['created', 'modified']:
+                # Our own write from a Notion sync, or a touch without changes
+                if self._file_unchanged_since_sync(file_path):
+                    return
+                
                 # Read and convert file
                 content = await self.obsidian_client.read_file(file_path)
+                if self._content_matches_sync(file_path, content):
+                    return
+                
                 notion_data = await self.obsidian_to_notion.convert(content, file_path)
                 
-                # Check for conflicts
+                # Conflicts are resolved in batches
                 if await self._has_conflict(notion_data):
-                    resolved_data = await self.conflict_resolver.resolve(notion_data)
-                    notion_data = resolved_data
+                    await self._queue_conflict({
+                        'side': 'obsidian',
+                        'title': notion_data['title'],
+                        'file_path': file_path,
+                        'data': notion_data,
+                        'content': content
+                    })
+                    return
                 
                 # Update Notion
-                await self.notion_client.create_or_update_page(notion_data)
+                page = await self.notion_client.create_or_update_page(notion_data)
+                self._forget_page(notion_data['title'])
+                self._record_sync(dict(page, title=notion_data['title']), file_path, content)
                 
             elif event_type == 'deleted':
                 # Archive corresponding Notion page
                 await self.notion_client.archive_page_by_title(file_path.stem)
+                self._forget_page(file_path.stem)
+                self.manifest.remove_path(file_path)
                 
         except Exception as e:
             self.logger.error(f"❌ Failed to handle Obsidian change: {e}")
@@ -153,65 +600,233 @@ class SyncManager:
         """Handle Notion page changes"""
         self.logger.info(f"📝 Notion change detected: {page_data['title']} ({event_type})")
         
+        if event_type == 'deleted':
+            self._page_meta_cache.pop(page_data['title'])
+        else:
+            self._remember_page_meta(page_data)
+        
         try:
             if event_type in ['created', 'modified']:
                 # Convert to Obsidian format
                 markdown_content = await self.notion_to_obsidian.convert(page_data)
                 
-                # Check for conflicts
+                # Same markdown as the file already holds: no write, and no watcher echo
                 file_path = self.obsidian_client.get_file_path(page_data['title'])
+                if self._file_holds(file_path, markdown_content):
+                    self._record_sync(page_data, file_path, markdown_content)
+                    return
+                
+                # Conflicts are resolved in batches
                 if await self._has_file_conflict(file_path, markdown_content):
-                    resolved_content = await self.conflict_resolver.resolve_file(
-                        file_path, markdown_content
-                    )
-                    markdown_content = resolved_content
+                    await self._queue_conflict({
+                        'side': 'notion',
+                        'title': page_data['title'],
+                        'file_path': file_path,
+                        'data': markdown_content,
+                        'page': page_data
+                    })
+                    return
                 
-                # Write to Obsidian
-                await self.obsidian_client.write_file(file_path, markdown_content)
+                # Write to Obsidian (an existing file without a conflict is already identical)
+                if self._mtime_ns(file_path) is None:
+                    await self.obsidian_client.write_file(file_path, markdown_content)
+                self._record_sync(page_data, file_path, markdown_content)
                 
             elif event_type == 'deleted':
                 # Delete corresponding Obsidian file
                 file_path = self.obsidian_client.get_file_path(page_data['title'])
                 await self.obsidian_client.delete_file(file_path)
+                self.manifest.remove_path(file_path)
                 
         except Exception as e:
             self.logger.error(f"❌ Failed to handle Notion change: {e}")
     
+    async def _queue_conflict(self, item: Dict):
+        """Hand a conflict to the batch resolver (or resolve now if not watching)"""
+        if self._conflict_task is None:
+            await self._resolve_conflict_batch([item])
+        else:
+            await self._conflict_queue.put(item)
+    
+    async def _conflict_loop(self):
+        """Collect conflicts for a short window, then resolve them together"""
+        while True:
+            self._conflict_batch.append(await self._conflict_queue.get())
+            await asyncio.sleep(self._conflict_window)
+            while not self._conflict_queue.empty():
+                self._conflict_batch.append(self._conflict_queue.get_nowait())
+            
+            try:
+                await self._resolve_conflict_batch(self._conflict_batch)
+            except Exception as e:
+                self.logger.error(f"❌ Failed to resolve conflicts: {e}")
+            self._conflict_batch = []
+    
+    async def _resolve_conflict_batch(self, items: List[Dict]):
+        """Resolve a batch of conflicts, picking one winner per contested title"""
+        # Conflict graph: one vertex per (title, side) keeping the latest event; edges only
+        # join the Obsidian and Notion vertices of the same title, so a maximal independent
+        # set is every uncontested vertex plus one winner from each contested pair
+        vertices: Dict[Tuple[str, str], Dict] = {}
+        for item in items:
+            vertices[(item['title'], item['side'])] = item
+        
+        titles = {title for title, _ in vertices}
+        self.logger.info(f"⚖️ Resolving {len(vertices)} conflicts across {len(titles)} titles")
+        
+        winners = []
+        for title in titles:
+            obsidian_item = vertices.get((title, 'obsidian'))
+            notion_item = vertices.get((title, 'notion'))
+            if obsidian_item and notion_item:
+                winners.append(self._pick_conflict_winner(obsidian_item, notion_item))
+            else:
+                winners.append(obsidian_item or notion_item)
+        
+        results = await asyncio.gather(
+            *[self._apply_conflict_winner(item) for item in winners],
+            return_exceptions=True
+        )
+        
+        for item, result in zip(winners, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ Failed to resolve conflict for {item['title']}: {result}")
+    
+    def _pick_conflict_winner(self, obsidian_item: Dict, notion_item: Dict) -> Dict:
+        """Choose between both sides of a title edited in Obsidian and Notion at once"""
+        strategy = self.conflict_resolver.strategy
+        
+        if strategy == 'obsidian_wins':
+            return obsidian_item
+        
+        if strategy == 'newest_wins':
+            try:
+                file_mtime = obsidian_item['file_path'].stat().st_mtime
+                notion_edited = datetime.fromisoformat(
+                    notion_item['page']['last_edited_time'].replace('Z', '+00:00')
+                ).timestamp()
+                return obsidian_item if file_mtime > notion_edited else notion_item
+            except (OSError, KeyError, ValueError):
+                return notion_item
+        
+        # notion_wins, and manual: the file resolver writes conflict markers with both versions
+        return notion_item
+    
+    async def _apply_conflict_winner(self, item: Dict):
+        """Run the resolver for the winning side and write the result"""
+        file_path = item['file_path']
+        
+        if item['side'] == 'obsidian':
+            notion_data = await self.conflict_resolver.resolve(item['data'])
+            page = await self.notion_client.create_or_update_page(notion_data)
+            self._forget_page(notion_data['title'])
+            self._record_sync(dict(page, title=notion_data['title']), file_path, item['content'])
+        else:
+            markdown_content = await self.conflict_resolver.resolve_file(file_path, item['data'])
+            await self.obsidian_client.write_file(file_path, markdown_content)
+            self._record_sync(item['page'], file_path, markdown_content)
+    
     async def _has_conflict(self, notion_data: Dict) -> bool:
         """Check if there's a conflict with existing Notion page"""
-        existing_page = await self.notion_client.get_page_by_title(notion_data['title'])
-        if not existing_page:
-            return False
+        title = notion_data['title']
+        
+        existing_page = self._page_meta_cache.get(title)
+        if existing_page is None:
+            existing_page = await self._dedup.dedupe(
+                f"page_by_title:{title}",
+                lambda: self.notion_client.get_page_by_title(title)
+            )
+            if not existing_page:
+                return False
+            self._remember_page_meta(existing_page)
         
         # Compare last modified times
         return existing_page['last_edited_time'] > notion_data.get('last_modified', '')
     
+    def _remember_page_meta(self, page: Dict):
+        """Cache the metadata conflict checks need for a Notion page"""
+        self._page_meta_cache.set(page['title'], {
+            'id': page.get('id'),
+            'last_edited_time': page.get('last_edited_time', '')
+        })
+    
+    def _forget_page(self, title: str):
+        """Drop cached lookups for a title after writing to it"""
+        self._dedup.invalidate(f"page_by_title:{title}")
+        self._page_meta_cache.pop(title)
+    
     async def _has_file_conflict(self, file_path: Path, new_content: str) -> bool:
         """Check if there's a conflict with existing Obsidian file"""
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             return False
         
-        existing_content = await self.obsidian_client.read_file(file_path)
-        existing_modified = file_path.stat().st_mtime
+        # Text-mode writes translate newlines on some platforms, so bytes on disk
+        # can't be compared directly there
+        if os.linesep != '\n':
+            existing_content = await self.obsidian_client.read_file(file_path)
+            return existing_content != new_content
+        
+        # Different size means different content, no read needed
+        new_bytes = new_content.encode('utf-8')
+        if stat.st_size != len(new_bytes):
+            return True
         
-        # Simple conflict detection - can be enhanced
-        return existing_content != new_content
+        # Same size: compare digests, reusing the file's digest while it is unchanged
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_digests.get(str(file_path))
+        if cached is not None and cached[0] == stamp:
+            existing_digest = cached[1]
+        else:
+            hasher = hashlib.blake2b(digest_size=16)
+            async for chunk in self.obsidian_client.read_file_chunks(file_path, binary=True):
+                hasher.update(chunk)
+            existing_digest = hasher.digest()
+            self._file_digests[str(file_path)] = (stamp, existing_digest)
+        
+        return existing_digest != hashlib.blake2b(new_bytes, digest_size=16).digest()
     
     async def start_watching(self):
         """Start continuous sync with file watching"""
         self.logger.info("👀 Starting continuous sync...")
         
-        # Start watchers
-        await asyncio.gather(
+        self._conflict_task = asyncio.ensure_future(self._conflict_loop())
+        
+        # Start watchers; if one fails to start the other is cancelled
+        await run_together(
             self.file_watcher.start(),
             self.notion_watcher.start()
         )
     
+    def request_stop(self):
+        """Ask a running watch session to shut down"""
+        self._stop_event.set()
+    
+    async def wait_until_stopped(self):
+        """Block until request_stop() is called"""
+        await self._stop_event.wait()
+    
     async def stop_watching(self):
         """Stop continuous sync"""
         self.logger.info("🛑 Stopping continuous sync...")
         
-        await asyncio.gather(
+        # Drop changes still waiting out their debounce window
+        self.file_watcher.cancel_pending()
+        
+        # Resolve whatever is still waiting for its batch window
+        if self._conflict_task is not None:
+            self._conflict_task.cancel()
+            await asyncio.gather(self._conflict_task, return_exceptions=True)
+            self._conflict_task = None
+        
+        remaining, self._conflict_batch = self._conflict_batch, []
+        while not self._conflict_queue.empty():
+            remaining.append(self._conflict_queue.get_nowait())
+        if remaining:
+            await self._resolve_conflict_batch(remaining)
+        
+        await run_together(
             self.file_watcher.stop(),
             self.notion_watcher.stop()
         )
@@ -234,19 +849,33 @@ async def main():
             await sync_manager.initial_sync()
         
         if args.watch:
+            # Ctrl-C / SIGTERM end the session (no signal handlers on Windows:
+            # Ctrl-C cancels main and the cleanup below still runs)
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, sync_manager.request_stop)
+                except NotImplementedError:
+                    pass
+            
             await sync_manager.start_watching()
             
             # Keep running until interrupted
-            try:
-                while True:
-                    await asyncio.sleep(1)
-            except KeyboardInterrupt:
-                await sync_manager.stop_watching()
+            await sync_manager.wait_until_stopped()
+            await sync_manager.stop_watching()
     
     except Exception as e:
         logging.error(f"❌ Sync failed: {e}")
         raise
+    
+    finally:
+        sync_manager.manifest.close()
+        await sync_manager.notion_client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv-based loop when available: cheaper task switches and socket I/O
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
@@ -0,0 +1,63 @@
+"""The fast frontmatter path must agree with yaml.safe_load whenever it answers"""
+
+import itertools
+
+import pytest
+import yaml
+
+from obsidian_client.client import _fast_frontmatter
+
+KEYS = ['title', 'tags', 'key_1', 'a-b', 'on', 'On', 'yes', 'no', 'off', 'y', 'n', 'null',
+        'NULL', 'true', 'False', '~']
+
+VALUES = [
+    '', 'x', 'hello world', 'Hello World  ', 'on', 'Off', 'yes', 'NO', 'null', 'Null', 'y',
+    'true', '~', "'quoted'", '"double"', "'it''s'", '"esc\\n"', "''", '12', '-3', '+4', '0',
+    '012', '1_000', '1.5', '.inf', 'NaN', 'e5', 'a: b', 'a #c', '#c', '[a, b]', '[]',
+    '[ a , b ]', '[1, on]', '[a,]', '["a,b"]', '[x, [y]]', 'x\t', '\tx', 'café',
+    ' x', 'x　', 'x\r', '2024-01-01', '@at', '*ref', '&anchor', '!tag', '|', '>',
+]
+
+
+def _agrees(text: str):
+    fast = _fast_frontmatter(text)
+    if fast is None:
+        return
+    assert fast == yaml.safe_load(text), text
+
+
+@pytest.mark.parametrize('key,value', list(itertools.product(KEYS, VALUES)))
+def test_single_line_matches_yaml(key, value):
+    _agrees(f"{key}: {value}")
+
+
+@pytest.mark.parametrize('text', [
+    'title: a\ntags: [x, y]\ncount: 3',
+    'title: a\n\ntags: []',
+    'title: a\n  nested: b',
+    'title: a\ttab: b',
+    'title:\n- a\n- b',
+    'title: a\ntitle: b',
+    '# comment\ntitle: a',
+    'title: a\r\ntags: b',
+    'title:a',
+    ' title: a',
+])
+def test_documents_match_yaml(text):
+    _agrees(text)
+
+
+def test_reserved_keys_fall_back():
+    assert _fast_frontmatter('on: x') is None
+    assert _fast_frontmatter('null: x') is None
+
+
+def test_simple_document_takes_fast_path():
+    assert _fast_frontmatter('title: Note\ntags: [a, b]\ncount: 2') == {
+        'title': 'Note', 'tags': ['a', 'b'], 'count': 2
+    }
+
+
+def test_non_ascii_falls_back():
+    assert _fast_frontmatter('title: café') is None
+    assert _fast_frontmatter('title: x　') is None
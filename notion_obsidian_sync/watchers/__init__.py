@@ -1,7 +1,7 @@
 """File and Change Watcher Modules"""
 
 from .file_watcher import FileWatcher
-from .notion_watcher import NotionWatcher
+from .notion_watcher import NotionWatcher, NotionWebhookServer
 
-__all__ = ["FileWatcher", "NotionWatcher"]
+__all__ = ["FileWatcher", "NotionWatcher", "NotionWebhookServer"]
 
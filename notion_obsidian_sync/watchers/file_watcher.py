@@ -4,91 +4,181 @@ Monitors Obsidian vault for file changes and triggers sync
 """
 
 import asyncio
+import os
+import re
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import logging
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.observers.api import BaseObserver
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED,
+    FileSystemEventHandler, FileSystemEvent
+)
+
+# Filesystems that don't deliver native change notifications for remote writes
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', '9p', 'davfs', 'fuse.sshfs', 'fuse.rclone'
+}
+
+def _unescape_mount_field(field: str) -> str:
+    """Decode the octal escapes (e.g. \\040 for space) used in /proc/mounts"""
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), field)
+
+def is_network_filesystem(path: Path) -> bool:
+    """Best-effort check whether path lives on a network mount (Linux only)"""
+    try:
+        with open('/proc/mounts', 'r') as f:
+            mounts = [line.split()[:3] for line in f]
+    except OSError:
+        return False
+    
+    target = os.path.realpath(path)
+    best_mount, best_type = '', ''
+    for _, mount_point, fs_type in mounts:
+        mount_point = _unescape_mount_field(mount_point)
+        if target == mount_point or target.startswith(mount_point.rstrip('/') + '/'):
+            if len(mount_point) > len(best_mount):
+                best_mount, best_type = mount_point, fs_type
+    
+    return best_type in NETWORK_FILESYSTEMS
+
+# Event types that can change a note; opened/closed events (one per read on inotify) are dropped
+_HANDLED_EVENT_TYPES = frozenset({
+    EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED
+})
 
 class ObsidianFileHandler(FileSystemEventHandler):
     """Handle file system events for Obsidian files"""
     
-    def __init__(self, callback: Callable, sync_path: Path):
+    def __init__(self, callback: Callable, sync_path: Path, loop: asyncio.AbstractEventLoop,
+                 debounce: float = 1.0):
         self.callback = callback
         self.sync_path = sync_path
+        
+        # watchdog calls the on_* handlers from its observer thread; everything else
+        # runs on this loop
+        self._loop = loop
         self.logger = logging.getLogger(__name__)
         
-        # Debounce rapid file changes
-        self._pending_events = {}
-        self._debounce_delay = 1.0  # seconds
+        # Event paths are built on the watched path string, so a prefix check suffices
+        self._sync_prefix = os.path.join(str(sync_path), '')
+        
+        # Debounce rapid file changes: events collect in one batch (latest event per
+        # path) that is flushed once things go quiet, or after max_batch_delay at most
+        self._pending_batch: Dict[str, Tuple[Path, str]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_deadline: Optional[float] = None
+        self._debounce_delay = debounce  # seconds
+        self._max_batch_delay = debounce * 10
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def dispatch(self, event: FileSystemEvent):
+        # One filter for every event before watchdog's per-type dispatch
+        if event.is_directory or event.event_type not in _HANDLED_EVENT_TYPES:
+            return
+        if not (event.src_path.endswith('.md') or getattr(event, 'dest_path', '').endswith('.md')):
+            return
+        super().dispatch(event)
     
     def on_modified(self, event: FileSystemEvent):
-        if not event.is_directory and event.src_path.endswith('.md'):
-            self._schedule_callback(event.src_path, 'modified')
+        self._post(event.src_path, 'modified')
     
     def on_created(self, event: FileSystemEvent):
-        if not event.is_directory and event.src_path.endswith('.md'):
-            self._schedule_callback(event.src_path, 'created')
+        self._post(event.src_path, 'created')
     
     def on_deleted(self, event: FileSystemEvent):
-        if not event.is_directory and event.src_path.endswith('.md'):
-            self._schedule_callback(event.src_path, 'deleted')
+        self._post(event.src_path, 'deleted')
     
     def on_moved(self, event: FileSystemEvent):
-        if not event.is_directory and event.src_path.endswith('.md'):
-            # Handle as delete + create
-            self._schedule_callback(event.src_path, 'deleted')
-            if hasattr(event, 'dest_path'):
-                self._schedule_callback(event.dest_path, 'created')
+        # Handle as delete + create; editors that save via a temp file rename
+        # only have .md on the destination side
+        if event.src_path.endswith('.md'):
+            self._post(event.src_path, 'deleted')
+        if event.dest_path.endswith('.md'):
+            self._post(event.dest_path, 'created')
+    
+    def _post(self, file_path: str, event_type: str):
+        """Hand an event from the observer thread to the event loop"""
+        try:
+            self._loop.call_soon_threadsafe(self._schedule_callback, file_path, event_type)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
     
     def _schedule_callback(self, file_path: str, event_type: str):
         """Schedule callback with debouncing"""
-        path_obj = Path(file_path)
-        
         # Only process files in sync folder
-        if not self._is_in_sync_folder(path_obj):
+        if not self._is_in_sync_folder(file_path):
             return
         
-        # Cancel previous event for this file
-        if file_path in self._pending_events:
-            self._pending_events[file_path].cancel()
-        
-        # Schedule new event
-        loop = asyncio.get_event_loop()
-        self._pending_events[file_path] = loop.call_later(
-            self._debounce_delay,
-            self._execute_callback,
-            path_obj,
-            event_type
+        # Latest event wins for a path already in the batch (keeping its Path object)
+        pending = self._pending_batch.get(file_path)
+        path_obj = pending[0] if pending is not None else Path(file_path)
+        self._pending_batch[file_path] = (path_obj, event_type)
+        
+        # Push the flush back, but not past the batch deadline
+        now = self._loop.time()
+        if self._batch_deadline is None:
+            self._batch_deadline = now + self._max_batch_delay
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = self._loop.call_at(
+            min(now + self._debounce_delay, self._batch_deadline),
+            self._flush_batch
         )
     
-    def _is_in_sync_folder(self, file_path: Path) -> bool:
+    def _is_in_sync_folder(self, file_path: str) -> bool:
         """Check if file is in the sync folder"""
-        try:
-            file_path.relative_to(self.sync_path)
-            return True
-        except ValueError:
-            return False
+        return file_path.startswith(self._sync_prefix)
     
-    def _execute_callback(self, file_path: Path, event_type: str):
-        """Execute the callback in an async context"""
-        # Remove from pending events
-        if str(file_path) in self._pending_events:
-            del self._pending_events[str(file_path)]
+    def _flush_batch(self):
+        """Hand the whole batch to the callback in one call"""
+        batch: List[Tuple[Path, str]] = list(self._pending_batch.values())
+        self._pending_batch.clear()
+        self._flush_handle = None
+        self._batch_deadline = None
+        
+        if not batch:
+            return
         
         # Create async task for callback
-        loop = asyncio.get_event_loop()
-        loop.create_task(self.callback(file_path, event_type))
+        task = self._loop.create_task(self.callback(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def cancel_pending(self):
+        """Drop events still waiting for their batch to flush"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = None
+        self._batch_deadline = None
+        self._pending_batch.clear()
+    
+    async def wait_for_callbacks(self):
+        """Wait for batches already handed to the callback to finish"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
 
 class FileWatcher:
     """Watch Obsidian vault for file changes"""
     
-    def __init__(self, sync_path: Path, callback: Callable):
+    def __init__(self, sync_path: Path, callback: Callable, poll_interval: float = 30,
+                 use_polling: Optional[bool] = None, debounce: float = 1.0):
         self.sync_path = sync_path
+        
+        # Called with a list of (path, event_type) per debounced batch
         self.callback = callback
+        self.debounce = debounce
         self.logger = logging.getLogger(__name__)
         
-        self.observer: Optional[Observer] = None
+        # Native events (inotify/FSEvents/ReadDirectoryChangesW) unless the vault is on a
+        # network mount, where only polling sees remote changes
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling
+        
+        self.observer: Optional[BaseObserver] = None
         self.handler: Optional[ObsidianFileHandler] = None
     
     async def start(self):
@@ -96,10 +186,12 @@ class FileWatcher:
         self.logger.info(f"👀 Starting file watcher for {self.sync_path}")
         
         # Create handler
-        self.handler = ObsidianFileHandler(self.callback, self.sync_path)
+        self.handler = ObsidianFileHandler(
+            self.callback, self.sync_path, asyncio.get_running_loop(), self.debounce
+        )
         
         # Create observer
-        self.observer = Observer()
+        self.observer = self._create_observer()
         self.observer.schedule(
             self.handler,
             str(self.sync_path),
@@ -111,6 +203,18 @@ class FileWatcher:
         
         self.logger.info("✅ File watcher started")
     
+    def _create_observer(self) -> BaseObserver:
+        """Pick a native observer, or a polling one for network filesystems"""
+        use_polling = self.use_polling
+        if use_polling is None:
+            use_polling = is_network_filesystem(self.sync_path)
+        
+        if use_polling:
+            self.logger.info(f"🐢 Polling for changes every {self.poll_interval}s")
+            return PollingObserver(timeout=self.poll_interval)
+        
+        return Observer()
+    
     async def stop(self):
         """Stop watching for file changes"""
         if self.observer:
@@ -119,8 +223,19 @@ class FileWatcher:
             self.observer.join()
             self.observer = None
         
+        self.cancel_pending()
+        
+        # Let syncs already running finish before the caller closes what they use
+        if self.handler:
+            await self.handler.wait_for_callbacks()
+        
         self.logger.info("✅ File watcher stopped")
     
+    def cancel_pending(self):
+        """Drop file events that haven't been handed to the callback yet"""
+        if self.handler:
+            self.handler.cancel_pending()
+    
     def is_running(self) -> bool:
         """Check if watcher is running"""
         return self.observer is not None and self.observer.is_alive()
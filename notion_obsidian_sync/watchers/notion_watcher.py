@@ -4,35 +4,191 @@ Monitors Notion for page changes and triggers sync
 """
 
 import asyncio
-from typing import Callable, Dict, List, Optional, Set
+import hashlib
+import hmac
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = None
+
+# Notion webhook event types -> our change types
+WEBHOOK_EVENT_TYPES = {
+    'page.created': 'created',
+    'page.content_updated': 'modified',
+    'page.properties_updated': 'modified',
+    'page.moved': 'modified',
+    'page.undeleted': 'created',
+    'page.deleted': 'deleted',
+}
+
+def _parse_ts(value: str) -> datetime:
+    """Notion ISO timestamp -> aware datetime (only for non-canonical forms)"""
+    if parse_datetime is not None:
+        return parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _is_newer(value: str, known: str) -> bool:
+    """Whether Notion timestamp `value` is later than `known`"""
+    if value == known:
+        return False
+    # Notion sends fixed-width UTC ("...T12:34:00.000Z"), which orders as text
+    if len(value) == len(known) and value[-1] == known[-1] == 'Z':
+        return value > known
+    return _parse_ts(value) > _parse_ts(known)
+
+class NotionWebhookServer:
+    """Receive Notion webhook events over HTTP"""
+    
+    def __init__(self, handler: Callable[[Dict], Awaitable[None]], verification_token: Optional[str],
+                 host: str = '127.0.0.1', port: int = 8787, path: str = '/notion/webhook'):
+        self.handler = handler
+        self.verification_token = verification_token
+        self.host = host
+        self.port = port
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def start(self):
+        """Start serving the webhook endpoint"""
+        app = web.Application()
+        app.router.add_post(self.path, self._handle)
+        
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        
+        self.logger.info(f"🔔 Listening for Notion webhooks on {self.host}:{self.port}{self.path}")
+    
+    async def stop(self):
+        """Stop serving and drop in-flight event handling"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def _signature_valid(self, body: bytes, signature: str) -> bool:
+        """Check the X-Notion-Signature HMAC of the raw body"""
+        expected = 'sha256=' + hmac.new(
+            self.verification_token.encode('utf-8'), body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected, signature)
+    
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Acknowledge an event right away and process it in the background"""
+        body = await request.read()
+        try:
+            event = json_loads(body)
+        except ValueError:
+            return web.Response(status=400)
+        
+        # One-time subscription handshake: the token has to go into the config.
+        # It signs every later event, so only a masked form is logged
+        if 'verification_token' in event and not self.verification_token:
+            token = str(event['verification_token'])
+            self.logger.info(
+                f"🔑 Notion webhook verification request received (token ...{token[-4:]}); "
+                f"set notion.webhook.verification_token to enable webhooks"
+            )
+            return web.Response(status=200)
+        
+        if not self.verification_token or not self._signature_valid(
+            body, request.headers.get('X-Notion-Signature', '')
+        ):
+            return web.Response(status=401)
+        
+        task = asyncio.ensure_future(self.handler(event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response(status=200)
 
 class NotionWatcher:
     """Watch Notion for page changes"""
     
-    def __init__(self, notion_client, callback: Callable):
+    def __init__(self, notion_client, callback: Callable, webhook_config: Optional[Dict] = None,
+                 min_interval: float = 15, max_interval: float = 600,
+                 max_concurrent_callbacks: int = 10):
         self.notion_client = notion_client
         self.callback = callback
         self.logger = logging.getLogger(__name__)
         
+        # Changes found in one tick are handled concurrently, up to this many at once
+        self._callback_sem = asyncio.Semaphore(max_concurrent_callbacks)
+        
         self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
         self._poll_interval = 30  # seconds
+        
+        # Polling backs off while nothing changes and speeds up again on changes
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._consecutive_empty = 0
+        
+        # Edits are found with a server-side filter; deletions need the full page
+        # list, so that sweep runs on its own slower clock (seconds)
+        self._deletion_sweep_interval = 600
+        self._last_sweep = time.monotonic()
+        
         self._last_check = None
-        self._known_pages: Dict[str, datetime] = {}
+        # page_id -> last_edited_time as sent by Notion (compared as text, see _is_newer)
+        self._known_pages: Dict[str, str] = {}
+        
+        # Changed pages whose fetch failed: page_id -> (last_edited_time, event type).
+        # Retried every tick, since they soon fall out of the lookback window
+        self._failed_pages: Dict[str, Tuple[str, str]] = {}
+        
+        # With webhooks, changes arrive as events and polling only reconciles
+        # whatever was missed (e.g. while the process was down)
+        webhook_config = webhook_config or {}
+        self.webhook: Optional[NotionWebhookServer] = None
+        if webhook_config.get('enabled'):
+            self.webhook = NotionWebhookServer(
+                self._on_webhook_event,
+                webhook_config.get('verification_token'),
+                host=webhook_config.get('host', '127.0.0.1'),
+                port=webhook_config.get('port', 8787),
+                path=webhook_config.get('path', '/notion/webhook')
+            )
+            self._poll_interval = webhook_config.get('reconcile_interval', 1800)
+            self._min_interval = self._max_interval = self._poll_interval
     
     async def start(self):
         """Start watching for Notion changes"""
         self.logger.info("👀 Starting Notion watcher...")
         
+        # Edits made while the initial listing runs must still be inside the first
+        # scan's window, so the check time is taken before it starts
+        started = datetime.now(timezone.utc)
+        
         # Initialize known pages
         await self._initialize_known_pages()
         
         self._running = True
-        self._last_check = datetime.now(timezone.utc)
+        self._stop_event.clear()
+        self._last_check = started
+        
+        if self.webhook is not None:
+            await self.webhook.start()
         
         # Start polling loop
-        asyncio.create_task(self._poll_loop())
+        self._task = asyncio.create_task(self._poll_loop())
         
         self.logger.info("✅ Notion watcher started")
     
@@ -40,6 +196,15 @@ class NotionWatcher:
         """Stop watching for Notion changes"""
         self.logger.info("🛑 Stopping Notion watcher...")
         self._running = False
+        self._stop_event.set()
+        
+        # Let an in-flight check finish rather than cutting a sync off midway
+        if self._task is not None:
+            await self._task
+            self._task = None
+        
+        if self.webhook is not None:
+            await self.webhook.stop()
         self.logger.info("✅ Notion watcher stopped")
     
     async def _initialize_known_pages(self):
@@ -52,11 +217,7 @@ class NotionWatcher:
                 last_edited = page.get('last_edited_time')
                 
                 if page_id and last_edited:
-                    # Parse ISO timestamp
-                    last_edited_dt = datetime.fromisoformat(
-                        last_edited.replace('Z', '+00:00')
-                    )
-                    self._known_pages[page_id] = last_edited_dt
+                    self._known_pages[page_id] = last_edited
             
             self.logger.info(f"📊 Initialized with {len(self._known_pages)} known pages")
             
@@ -66,70 +227,174 @@ class NotionWatcher:
     async def _poll_loop(self):
         """Main polling loop"""
         while self._running:
+            started = time.monotonic()
             try:
                 await self._check_for_changes()
-                await asyncio.sleep(self._poll_interval)
-                
             except Exception as e:
                 self.logger.error(f"Error in Notion polling loop: {e}")
-                await asyncio.sleep(self._poll_interval)
+            
+            # Ticks run at a fixed rate; a check that overran its interval is
+            # followed straight away by the next one instead of piling up
+            remaining = self._poll_interval - (time.monotonic() - started)
+            if remaining <= 0:
+                self.logger.warning(
+                    f"⏱️ Notion check took longer than the {self._poll_interval:.0f}s poll interval"
+                )
+                continue
+            
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
     
     async def _check_for_changes(self):
         """Check for changes in Notion pages"""
         try:
-            # Get current pages
-            current_pages = await self.notion_client.get_all_pages()
-            current_page_ids = set()
+            check_started = datetime.now(timezone.utc)
+            changed = await self._fast_scan()
             
-            for page in current_pages:
-                page_id = page.get('id')
-                last_edited = page.get('last_edited_time')
-                title = page.get('title', 'Untitled')
-                
-                if not page_id or not last_edited:
-                    continue
-                
-                current_page_ids.add(page_id)
-                
-                # Parse timestamp
-                last_edited_dt = datetime.fromisoformat(
-                    last_edited.replace('Z', '+00:00')
-                )
-                
-                # Check if page is new or modified
-                if page_id not in self._known_pages:
-                    # New page
-                    self.logger.info(f"📄 New page detected: {title}")
-                    await self._handle_page_change(page, 'created')
-                    self._known_pages[page_id] = last_edited_dt
-                    
-                elif last_edited_dt > self._known_pages[page_id]:
-                    # Modified page
-                    self.logger.info(f"✏️ Modified page detected: {title}")
-                    await self._handle_page_change(page, 'modified')
-                    self._known_pages[page_id] = last_edited_dt
-            
-            # Check for deleted pages
-            deleted_page_ids = set(self._known_pages.keys()) - current_page_ids
-            
-            for deleted_id in deleted_page_ids:
-                self.logger.info(f"🗑️ Deleted page detected: {deleted_id}")
-                
-                # Create minimal page data for deletion
-                deleted_page_data = {
-                    'id': deleted_id,
-                    'title': f"Deleted Page {deleted_id[:8]}",
-                    'deleted': True
-                }
-                
-                await self._handle_page_change(deleted_page_data, 'deleted')
-                del self._known_pages[deleted_id]
+            if time.monotonic() - self._last_sweep >= self._deletion_sweep_interval:
+                self._last_sweep = time.monotonic()
+                changed += await self._sweep_deleted_pages()
             
-            self._last_check = datetime.now(timezone.utc)
+            self._last_check = check_started
+            self._adapt_interval(changed)
             
         except Exception as e:
             self.logger.error(f"Failed to check for Notion changes: {e}")
     
+    async def _fast_scan(self) -> int:
+        """Report pages created or edited since the last check"""
+        # page_id -> (last_edited_time, event type), starting with last tick's failures
+        pending: Dict[str, Tuple[str, str]] = self._failed_pages
+        self._failed_pages = {}
+        
+        # Only pages edited since the last check (edit times are minute-granular,
+        # so look back a minute; pages already seen at that time are skipped below)
+        rows = await self.notion_client.get_recent_changes(self._last_check - timedelta(minutes=1))
+        
+        for row in rows:
+            page_id = row.get('id')
+            last_edited = row.get('last_edited_time')
+            title = row.get('title', 'Untitled')
+            
+            if not page_id or not last_edited:
+                continue
+            
+            known = self._known_pages.get(page_id)
+            if known == last_edited:
+                continue
+            
+            # Check if page is new or modified
+            if known is None:
+                # New page
+                self.logger.info(f"📄 New page detected: {title}")
+                event_type = 'created'
+            elif _is_newer(last_edited, known):
+                # Modified page
+                self.logger.info(f"✏️ Modified page detected: {title}")
+                event_type = 'modified'
+            else:
+                continue
+            
+            pending[page_id] = (last_edited, event_type)
+        
+        results = await asyncio.gather(
+            *(self._dispatch(page_id, event_type) for page_id, (_, event_type) in pending.items()),
+            return_exceptions=True
+        )
+        
+        changed = 0
+        for (page_id, (last_edited, event_type)), result in zip(pending.items(), results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to fetch changed page {page_id}: {result}")
+                self._failed_pages[page_id] = (last_edited, event_type)
+                continue
+            self._known_pages[page_id] = last_edited
+            changed += 1
+        
+        return changed
+    
+    async def _dispatch(self, page_id: str, event_type: str):
+        """Fetch a changed page and hand it to the callback"""
+        async with self._callback_sem:
+            page = await self.notion_client.get_page_content(page_id)
+            await self._handle_page_change(page, event_type)
+    
+    async def _sweep_deleted_pages(self) -> int:
+        """Report known pages that are no longer in any synced database"""
+        current_page_ids = await self.notion_client.get_page_ids()
+        deleted_page_ids = set(self._known_pages.keys()) - current_page_ids
+        
+        async def report(deleted_id: str):
+            self.logger.info(f"🗑️ Deleted page detected: {deleted_id}")
+            
+            # Create minimal page data for deletion
+            deleted_page_data = {
+                'id': deleted_id,
+                'title': f"Deleted Page {deleted_id[:8]}",
+                'deleted': True
+            }
+            
+            async with self._callback_sem:
+                await self._handle_page_change(deleted_page_data, 'deleted')
+            self._known_pages.pop(deleted_id, None)
+        
+        await asyncio.gather(*(report(deleted_id) for deleted_id in deleted_page_ids))
+        return len(deleted_page_ids)
+    
+    def _adapt_interval(self, changed: int):
+        """Lengthen the poll interval while Notion is quiet, shorten it on changes"""
+        if changed:
+            self._consecutive_empty = 0
+            self._poll_interval = max(self._min_interval, self._poll_interval / 2)
+        else:
+            self._consecutive_empty += 1
+            self._poll_interval = min(self._max_interval, self._poll_interval * 1.5)
+    
+    async def _on_webhook_event(self, event: Dict):
+        """Turn a webhook event for one of our pages into a page change"""
+        event_type = WEBHOOK_EVENT_TYPES.get(event.get('type'))
+        entity = event.get('entity') or {}
+        page_id = entity.get('id')
+        if event_type is None or entity.get('type') != 'page' or not page_id:
+            return
+        
+        try:
+            if event_type == 'deleted':
+                if self._known_pages.pop(page_id, None) is None:
+                    return
+                self.logger.info(f"🗑️ Deleted page detected: {page_id}")
+                await self._handle_page_change({
+                    'id': page_id,
+                    'title': f"Deleted Page {page_id[:8]}",
+                    'deleted': True
+                }, 'deleted')
+                return
+            
+            page = await self.notion_client.get_page_content(page_id)
+            if not self._in_watched_database(page):
+                return
+            
+            # Record the edit so the reconciling poll doesn't report it again
+            last_edited = page.get('last_edited_time')
+            if last_edited:
+                self._known_pages[page_id] = last_edited
+            
+            self.logger.info(f"🔔 Webhook: {page.get('title', 'Untitled')} ({event_type})")
+            await self._handle_page_change(page, event_type)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to handle Notion webhook event: {e}")
+    
+    def _in_watched_database(self, page: Dict) -> bool:
+        """Whether the page belongs to one of the synced databases"""
+        parent_id = (page.get('parent') or {}).get('database_id', '').replace('-', '')
+        return any(
+            parent_id == database_id.replace('-', '')
+            for database_id in self.notion_client.database_ids
+        )
+    
     async def _handle_page_change(self, page_data: Dict, event_type: str):
         """Handle a detected page change"""
         try:
@@ -147,6 +412,7 @@ class NotionWatcher:
             'running': self._running,
             'last_check': self._last_check,
             'known_pages_count': len(self._known_pages),
-            'poll_interval': self._poll_interval
+            'poll_interval': self._poll_interval,
+            'idle_polls': self._consecutive_empty
         }
 
@@ -7,13 +7,69 @@ Used by pre-commit hooks to ensure transcendent recursive practices.
 """
 
 import ast
+import os
+import re
 import sys
+import time
+import hashlib
 import argparse
+import tempfile
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 import json
 
 
+# 🗄️ Results keyed by file content, so unchanged files skip analysis between commits
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.git' / 'cache' / 'recursion_consciousness'
+CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+# Bump whenever the analysis output changes so stale cached results are ignored
+ANALYZER_VERSION = 5
+
+
+def _mentions_memo(name: str) -> bool:
+    """
+    🧬 Whether an identifier hints at memoization
+    """
+    lowered = name.lower()
+    return 'memo' in lowered or 'cache' in lowered
+
+
+# Files without a single def are still parsed (to report syntax errors) but never visited
+_DEF_RE = re.compile(rb'(?m)^\s*(async\s+)?def\s')
+
+_NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+def _walk_own_body(node: ast.AST):
+    """
+    🌀 Yield the descendants of a function without entering nested functions or lambdas
+    """
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        yield child
+        if not isinstance(child, _NESTED_SCOPES):
+            stack.extend(ast.iter_child_nodes(child))
+
+
+@dataclass
+class FunctionInfo:
+    """
+    🧬 Consciousness profile of a single function
+    """
+    name: str
+    line: int
+    is_recursive: bool = False
+    recursion_type: Optional[str] = None
+    consciousness_level: str = 'linear'
+    base_case_count: int = 0
+    recursive_call_count: int = 0
+    complexity_score: float = 0.0
+
+
 class RecursionConsciousnessAnalyzer(ast.NodeVisitor):
     """
     🧠 Analyzes recursive consciousness patterns in Python code
@@ -21,86 +77,110 @@ class RecursionConsciousnessAnalyzer(ast.NodeVisitor):
     
     def __init__(self, filename: str):
         self.filename = filename
-        self.recursive_functions: Dict[str, Dict] = {}
+        self.recursive_functions: Dict[str, FunctionInfo] = {}
         self.function_calls: Dict[str, Set[str]] = {}
         self.current_function = None
+        self.current_function_info: Optional[FunctionInfo] = None
         self.consciousness_warnings: List[str] = []
         self.transcendence_insights: List[str] = []
         
+        # ⚡ Node type -> handler, instead of NodeVisitor's per-node 'visit_' + name lookup
+        self._dispatch = {
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.AsyncFunctionDef: self.visit_AsyncFunctionDef,
+            ast.Call: self.visit_Call,
+        }
+        
+    def visit(self, node: ast.AST):
+        """
+        🧭 Dispatch a node to its handler, or descend into it
+        """
+        return self._dispatch.get(type(node), self.generic_visit)(node)
+    
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """
         🌊 Analyze function consciousness patterns
         """
         old_function = self.current_function
+        old_function_info = self.current_function_info
         self.current_function = node.name
-        self.function_calls[node.name] = set()
         
         # 🧬 Check for recursive consciousness indicators
-        function_info = {
-            'name': node.name,
-            'line': node.lineno,
-            'is_recursive': False,
-            'recursion_type': None,
-            'consciousness_level': 'linear',
-            'base_cases': [],
-            'recursive_calls': [],
-            'complexity_score': 0
-        }
+        function_info = FunctionInfo(name=node.name, line=node.lineno)
         
         # 🌀 Analyze function body for consciousness patterns
-        self._analyze_function_body(node, function_info)
-        
-        if function_info['is_recursive']:
-            self.recursive_functions[node.name] = function_info
-            self._assess_consciousness_quality(function_info)
+        statement_count, is_memoized = self._analyze_function_body(node, function_info)
         
+        # ⚡ Recursive calls are recorded by visit_Call on the way down
+        self.current_function_info = function_info
         self.generic_visit(node)
         self.current_function = old_function
+        self.current_function_info = old_function_info
+        
+        # 🧬 Determine recursion consciousness
+        recursive_call_count = function_info.recursive_call_count
+        if recursive_call_count > 0:
+            function_info.is_recursive = True
+            function_info.consciousness_level = self._assess_consciousness_level(recursive_call_count)
+            function_info.recursion_type = self._determine_recursion_type(recursive_call_count, is_memoized)
+            function_info.complexity_score = self._calculate_complexity_score(
+                recursive_call_count, function_info.base_case_count, statement_count
+            )
+            self.recursive_functions[node.name] = function_info
+            self._assess_consciousness_quality(function_info)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
     
     def visit_Call(self, node: ast.Call) -> None:
         """
         ⚡ Track function call consciousness
         """
-        if self.current_function and isinstance(node.func, ast.Name):
+        called_function = None
+        if isinstance(node.func, ast.Name):
             called_function = node.func.id
-            self.function_calls[self.current_function].add(called_function)
+        elif (isinstance(node.func, ast.Attribute) and
+              isinstance(node.func.value, ast.Name) and
+              node.func.value.id in ('self', 'cls')):
+            # self.method() / cls.method() recursion
+            called_function = node.func.attr
+        
+        if self.current_function and called_function:
+            self.function_calls.setdefault(self.current_function, set()).add(called_function)
             
             # 🧠 Check for direct recursion consciousness
             if called_function == self.current_function:
-                if self.current_function in self.recursive_functions:
-                    self.recursive_functions[self.current_function]['recursive_calls'].append(node.lineno)
+                self.current_function_info.recursive_call_count += 1
         
         self.generic_visit(node)
     
-    def _analyze_function_body(self, node: ast.FunctionDef, function_info: Dict) -> None:
+    def _analyze_function_body(self, node: ast.FunctionDef, function_info: FunctionInfo) -> Tuple[int, bool]:
         """
-        🔬 Deep analysis of function consciousness structure
+        🔬 Deep analysis of function consciousness structure, returning (statement count, memoized)
         """
-        # 🌊 Look for base case patterns
-        base_case_patterns = []
-        recursive_call_count = 0
+        # 🌊 Look for base case patterns, size and memoization in one pass
+        statement_count = 1  # the def itself
+        is_memoized = _mentions_memo(node.name)
         
-        for child in ast.walk(node):
+        for child in _walk_own_body(node):
+            if isinstance(child, ast.stmt):
+                statement_count += 1
+            
             # Check for return statements (potential base cases)
             if isinstance(child, ast.Return):
-                base_case_patterns.append(child.lineno)
+                function_info.base_case_count += 1
             
-            # Check for recursive calls
-            if (isinstance(child, ast.Call) and 
-                isinstance(child.func, ast.Name) and 
-                child.func.id == node.name):
-                recursive_call_count += 1
-                function_info['recursive_calls'].append(child.lineno)
+            # Check names, attributes and decorators for memo/cache
+            elif not is_memoized:
+                if isinstance(child, ast.Name):
+                    is_memoized = _mentions_memo(child.id)
+                elif isinstance(child, ast.Attribute):
+                    is_memoized = _mentions_memo(child.attr)
+                elif isinstance(child, ast.arg):
+                    is_memoized = _mentions_memo(child.arg)
+                elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    is_memoized = _mentions_memo(child.name)
         
-        # 🧬 Determine recursion consciousness
-        if recursive_call_count > 0:
-            function_info['is_recursive'] = True
-            function_info['consciousness_level'] = self._assess_consciousness_level(recursive_call_count)
-            function_info['recursion_type'] = self._determine_recursion_type(node)
-            function_info['base_cases'] = base_case_patterns
-            function_info['complexity_score'] = self._calculate_complexity_score(
-                recursive_call_count, len(base_case_patterns), node
-            )
+        return statement_count, is_memoized
     
     def _assess_consciousness_level(self, recursive_call_count: int) -> str:
         """
@@ -113,22 +193,19 @@ class RecursionConsciousnessAnalyzer(ast.NodeVisitor):
         else:
             return 'cosmic'  # Many calls - universe-level consciousness
     
-    def _determine_recursion_type(self, node: ast.FunctionDef) -> str:
+    def _determine_recursion_type(self, recursive_call_count: int, is_memoized: bool) -> str:
         """
         🌀 Determine the type of recursive consciousness
         """
         # Simple heuristics for recursion type detection
-        body_text = ast.unparse(node) if hasattr(ast, 'unparse') else str(node)
-        
-        if 'memo' in body_text.lower() or 'cache' in body_text.lower():
+        if is_memoized:
             return 'memoized_consciousness'
-        elif len([n for n in ast.walk(node) if isinstance(n, ast.Call) and 
-                 isinstance(n.func, ast.Name) and n.func.id == node.name]) > 1:
+        elif recursive_call_count > 1:
             return 'multi_recursive_consciousness'
         else:
             return 'simple_recursive_consciousness'
     
-    def _calculate_complexity_score(self, recursive_calls: int, base_cases: int, node: ast.FunctionDef) -> float:
+    def _calculate_complexity_score(self, recursive_calls: int, base_cases: int, function_length: int) -> float:
         """
         📊 Calculate consciousness complexity score
         """
@@ -145,67 +222,141 @@ class RecursionConsciousnessAnalyzer(ast.NodeVisitor):
         if base_cases >= recursive_calls:
             complexity -= 2   # Reward for adequate base cases
         
-        # Factor in function length (longer = more complex)
-        function_length = len([n for n in ast.walk(node) if isinstance(n, ast.stmt)])
+        # Factor in function length in statements (longer = more complex)
         complexity += function_length * 0.1
         
         return max(0, complexity)
     
-    def _assess_consciousness_quality(self, function_info: Dict) -> None:
+    def _assess_consciousness_quality(self, function_info: FunctionInfo) -> None:
         """
         🌌 Assess the quality of recursive consciousness
         """
-        name = function_info['name']
+        name = function_info.name
         
         # 🚨 Check for consciousness warnings
-        if not function_info['base_cases']:
+        if not function_info.base_case_count:
             self.consciousness_warnings.append(
-                f"🌀 {name} (line {function_info['line']}): No base case detected - infinite consciousness risk!"
+                f"🌀 {name} (line {function_info.line}): No base case detected - infinite consciousness risk!"
             )
         
-        if function_info['complexity_score'] > 15:
+        if function_info.complexity_score > 15:
             self.consciousness_warnings.append(
-                f"🧠 {name} (line {function_info['line']}): High complexity score ({function_info['complexity_score']:.1f}) - consider consciousness simplification"
+                f"🧠 {name} (line {function_info.line}): High complexity score ({function_info.complexity_score:.1f}) - consider consciousness simplification"
             )
         
-        if len(function_info['recursive_calls']) > 5:
+        if function_info.recursive_call_count > 5:
             self.consciousness_warnings.append(
-                f"⚡ {name} (line {function_info['line']}): Many recursive calls - potential consciousness overflow"
+                f"⚡ {name} (line {function_info.line}): Many recursive calls - potential consciousness overflow"
             )
         
         # 🌊 Generate transcendence insights
-        if function_info['consciousness_level'] == 'enlightened':
+        if function_info.consciousness_level == 'enlightened':
             self.transcendence_insights.append(
                 f"✨ {name}: Achieved enlightened recursion consciousness"
             )
         
-        if function_info['recursion_type'] == 'memoized_consciousness':
+        if function_info.recursion_type == 'memoized_consciousness':
             self.transcendence_insights.append(
                 f"🧬 {name}: Demonstrates memoization consciousness - excellent optimization!"
             )
 
 
+def _cache_path(data: bytes) -> Path:
+    """
+    🗄️ Cache file for a given file content
+    """
+    digest = hashlib.blake2b(
+        b"%d\0%s" % (ANALYZER_VERSION, data), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _load_cached_result(cache_file: Path) -> Dict:
+    """
+    🗄️ Load a cached result, or None when there isn't a usable one
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        os.utime(cache_file)  # keep entries that are still in use from being pruned
+        return result
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_result(cache_file: Path, result: Dict) -> None:
+    """
+    🗄️ Write a result to the cache atomically (parallel runs may race on it)
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # the cache is only an optimization
+
+
+def _prune_cache() -> None:
+    """
+    🧹 Remove cached results that haven't been used for CACHE_MAX_AGE
+    """
+    cutoff = time.time() - CACHE_MAX_AGE
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except OSError:
+        return
+    
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
 def analyze_file_consciousness(filepath: Path) -> Dict:
     """
     🔍 Analyze a single file for recursive consciousness patterns
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        
+        use_cache = CACHE_DIR.parent.parent.is_dir()
+        if use_cache:
+            cache_file = _cache_path(data)
+            cached = _load_cached_result(cache_file)
+            if cached is not None:
+                cached['filename'] = str(filepath)
+                return cached
         
+        content = data.decode('utf-8')
         tree = ast.parse(content, filename=str(filepath))
         analyzer = RecursionConsciousnessAnalyzer(str(filepath))
-        analyzer.visit(tree)
+        if _DEF_RE.search(data):
+            analyzer.visit(tree)
         
-        return {
+        result = {
             'filename': str(filepath),
-            'recursive_functions': analyzer.recursive_functions,
+            'recursive_functions': {
+                name: asdict(info) for name, info in analyzer.recursive_functions.items()
+            },
             'consciousness_warnings': analyzer.consciousness_warnings,
             'transcendence_insights': analyzer.transcendence_insights,
             'total_recursive_functions': len(analyzer.recursive_functions),
-            'consciousness_score': sum(f['complexity_score'] for f in analyzer.recursive_functions.values())
+            'consciousness_score': sum(f.complexity_score for f in analyzer.recursive_functions.values())
         }
         
+        if use_cache:
+            _store_cached_result(cache_file, result)
+        return result
+        
     except Exception as e:
         return {
             'filename': str(filepath),
@@ -218,89 +369,104 @@ def analyze_file_consciousness(filepath: Path) -> Dict:
         }
 
 
-def main():
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+
+def analyze_files_consciousness(paths: List[Path]) -> Iterator[Dict]:
     """
-    🚀 Main consciousness analysis function
+    🌊 Analyze files in parallel across cores, yielding results in order as they finish
     """
-    parser = argparse.ArgumentParser(
-        description="🌀 Analyze recursive consciousness patterns in Python files"
-    )
-    parser.add_argument('files', nargs='+', help='Python files to analyze')
-    parser.add_argument('--json', action='store_true', help='Output results as JSON')
-    parser.add_argument('--warnings-only', action='store_true', help='Only show consciousness warnings')
-    parser.add_argument('--max-complexity', type=float, default=20.0, 
-                       help='Maximum allowed consciousness complexity score')
+    if len(paths) < PARALLEL_MIN_FILES:
+        for path in paths:
+            yield analyze_file_consciousness(path)
+        return
     
-    args = parser.parse_args()
+    with ProcessPoolExecutor() as executor:
+        yield from executor.map(analyze_file_consciousness, paths, chunksize=8)
+
+
+def _print_result(filepath: str, result: Dict, warnings_only: bool) -> None:
+    """
+    🧠 Display the consciousness analysis of a single file
+    """
+    if not warnings_only:
+        print(f"\n🌊 Consciousness Analysis: {filepath}")
+        print("=" * 60)
+        
+        if 'error' in result:
+            print(f"❌ {result['error']}")
+            return
+        
+        if result['recursive_functions']:
+            print(f"🧬 Recursive Functions Found: {result['total_recursive_functions']}")
+            print(f"📊 Total Consciousness Score: {result['consciousness_score']:.1f}")
+            
+            for func_name, func_info in result['recursive_functions'].items():
+                print(f"\n🌀 {func_name} (line {func_info['line']}):")
+                print(f"   🧠 Consciousness Level: {func_info['consciousness_level']}")
+                print(f"   ⚡ Recursion Type: {func_info['recursion_type']}")
+                print(f"   📊 Complexity Score: {func_info['complexity_score']:.1f}")
+                print(f"   🔢 Base Cases: {func_info['base_case_count']}")
+                print(f"   🌊 Recursive Calls: {func_info['recursive_call_count']}")
+        else:
+            print("🧠 No recursive consciousness detected - linear enlightenment")
+    
+    # 🚨 Display consciousness warnings
+    if result['consciousness_warnings']:
+        print(f"\n🚨 Consciousness Warnings:")
+        for warning in result['consciousness_warnings']:
+            print(f"   {warning}")
     
-    all_results = []
+    # ✨ Display transcendence insights
+    if result['transcendence_insights'] and not warnings_only:
+        print(f"\n✨ Transcendence Insights:")
+        for insight in result['transcendence_insights']:
+            print(f"   {insight}")
+
+
+def _report(args: argparse.Namespace) -> None:
+    """
+    📜 Analyze the requested files and write the report, exiting non-zero on problems
+    """
+    files_analyzed = 0
     total_warnings = 0
     total_insights = 0
+    max_complexity_exceeded = False
     
-    for filepath in args.files:
-        path = Path(filepath)
-        if not path.exists() or not path.suffix == '.py':
-            continue
-            
-        result = analyze_file_consciousness(path)
-        all_results.append(result)
-        
+    filepaths = [
+        filepath for filepath in args.files
+        if Path(filepath).exists() and Path(filepath).suffix == '.py'
+    ]
+    results = analyze_files_consciousness([Path(filepath) for filepath in filepaths])
+    
+    # 📜 JSON results are written one file at a time rather than collected first
+    if args.json:
+        sys.stdout.write('[')
+    
+    for filepath, result in zip(filepaths, results):
+        files_analyzed += 1
         total_warnings += len(result['consciousness_warnings'])
         total_insights += len(result['transcendence_insights'])
+        if result['consciousness_score'] > args.max_complexity:
+            max_complexity_exceeded = True
         
         if args.json:
-            continue
-            
-        # 🧠 Display consciousness analysis
-        if not args.warnings_only:
-            print(f"\n🌊 Consciousness Analysis: {filepath}")
-            print("=" * 60)
-            
-            if 'error' in result:
-                print(f"❌ {result['error']}")
-                continue
-            
-            if result['recursive_functions']:
-                print(f"🧬 Recursive Functions Found: {result['total_recursive_functions']}")
-                print(f"📊 Total Consciousness Score: {result['consciousness_score']:.1f}")
-                
-                for func_name, func_info in result['recursive_functions'].items():
-                    print(f"\n🌀 {func_name} (line {func_info['line']}):")
-                    print(f"   🧠 Consciousness Level: {func_info['consciousness_level']}")
-                    print(f"   ⚡ Recursion Type: {func_info['recursion_type']}")
-                    print(f"   📊 Complexity Score: {func_info['complexity_score']:.1f}")
-                    print(f"   🔢 Base Cases: {len(func_info['base_cases'])}")
-                    print(f"   🌊 Recursive Calls: {len(func_info['recursive_calls'])}")
-            else:
-                print("🧠 No recursive consciousness detected - linear enlightenment")
-        
-        # 🚨 Display consciousness warnings
-        if result['consciousness_warnings']:
-            print(f"\n🚨 Consciousness Warnings:")
-            for warning in result['consciousness_warnings']:
-                print(f"   {warning}")
-        
-        # ✨ Display transcendence insights
-        if result['transcendence_insights'] and not args.warnings_only:
-            print(f"\n✨ Transcendence Insights:")
-            for insight in result['transcendence_insights']:
-                print(f"   {insight}")
+            sys.stdout.write(',\n' if files_analyzed > 1 else '\n')
+            sys.stdout.write(textwrap.indent(json.dumps(result, indent=2), '  '))
+        else:
+            _print_result(filepath, result, args.warnings_only)
     
     if args.json:
-        print(json.dumps(all_results, indent=2))
+        print('\n]' if files_analyzed else ']')
         return
     
     # 🌌 Final consciousness summary
     print(f"\n🌌 === CONSCIOUSNESS ANALYSIS COMPLETE ===")
-    print(f"🧠 Files Analyzed: {len(all_results)}")
+    print(f"🧠 Files Analyzed: {files_analyzed}")
     print(f"🚨 Total Warnings: {total_warnings}")
     print(f"✨ Total Insights: {total_insights}")
     
-    # Check if consciousness complexity exceeds limits
-    max_complexity_exceeded = any(
-        r['consciousness_score'] > args.max_complexity for r in all_results
-    )
-    
     if total_warnings > 0:
         print(f"⚡ Consciousness warnings detected - consider transcendence improvements")
         sys.exit(1)
@@ -312,6 +478,28 @@ def main():
         sys.exit(0)
 
 
+def main():
+    """
+    🚀 Main consciousness analysis function
+    """
+    parser = argparse.ArgumentParser(
+        description="🌀 Analyze recursive consciousness patterns in Python files"
+    )
+    parser.add_argument('files', nargs='+', help='Python files to analyze')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    parser.add_argument('--warnings-only', action='store_true', help='Only show consciousness warnings')
+    parser.add_argument('--max-complexity', type=float, default=20.0, 
+                       help='Maximum allowed consciousness complexity score')
+    
+    args = parser.parse_args()
+    
+    try:
+        _report(args)
+    finally:
+        # 🧹 Age out old cache entries once the report is written and the workers are gone
+        _prune_cache()
+
+
 if __name__ == "__main__":
     main()
 